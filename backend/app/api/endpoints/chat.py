@@ -2,8 +2,9 @@
 Chat API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
 import uuid
 from datetime import datetime
 from app.db.session import get_db
@@ -43,24 +44,62 @@ async def process_chat_query(
     )
     
     # Update conversation history
-    if request.conversation_id:
-        if request.conversation_id not in conversations:
-            conversations[request.conversation_id] = {
-                "fund_id": request.fund_id,
-                "messages": [],
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            }
-        
-        conversations[request.conversation_id]["messages"].extend([
-            {"role": "user", "content": request.query, "timestamp": datetime.utcnow()},
-            {"role": "assistant", "content": response["answer"], "timestamp": datetime.utcnow()}
-        ])
-        conversations[request.conversation_id]["updated_at"] = datetime.utcnow()
+    _record_exchange(request, response["answer"])
     
     return ChatQueryResponse(**response)
 
 
+@router.post("/query/stream")
+async def stream_chat_query(
+    request: ChatQueryRequest,
+    db: Session = Depends(get_db)
+):
+    """Process a chat query using RAG, streaming the answer as plain text"""
+    
+    # Get conversation history if conversation_id provided
+    conversation_history = []
+    if request.conversation_id and request.conversation_id in conversations:
+        conversation_history = conversations[request.conversation_id]["messages"]
+    
+    query_engine = QueryEngine(db)
+    fragments = await query_engine.stream_query(
+        query=request.query,
+        fund_id=request.fund_id,
+        conversation_history=conversation_history
+    )
+    
+    async def answer_stream() -> AsyncIterator[str]:
+        answer_parts = []
+        async for fragment in fragments:
+            answer_parts.append(fragment)
+            yield fragment
+        
+        # Update conversation history once the full answer is known
+        _record_exchange(request, "".join(answer_parts))
+    
+    return StreamingResponse(answer_stream(), media_type="text/plain")
+
+
+def _record_exchange(request: ChatQueryRequest, answer: str):
+    """Append a query/answer pair to the request's conversation, if any"""
+    if not request.conversation_id:
+        return
+    
+    if request.conversation_id not in conversations:
+        conversations[request.conversation_id] = {
+            "fund_id": request.fund_id,
+            "messages": [],
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+    
+    conversations[request.conversation_id]["messages"].extend([
+        {"role": "user", "content": request.query, "timestamp": datetime.utcnow()},
+        {"role": "assistant", "content": answer, "timestamp": datetime.utcnow()}
+    ])
+    conversations[request.conversation_id]["updated_at"] = datetime.utcnow()
+
+
 @router.post("/conversations", response_model=Conversation)
 async def create_conversation(request: ConversationCreate):
     """Create a new conversation"""
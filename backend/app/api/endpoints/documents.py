@@ -8,7 +8,7 @@ import os
 import shutil
 from datetime import datetime
 from app.db.session import get_db
-from app.models.document import Document
+from app.models.document import Document, ParsingStatus
 from app.schemas.document import (
     Document as DocumentSchema,
     DocumentUploadResponse,
@@ -60,7 +60,7 @@ async def upload_document(
         fund_id=fund_id,
         file_name=file.filename,
         file_path=file_path,
-        parsing_status="pending"
+        parsing_status=ParsingStatus.PENDING
     )
     db.add(document)
     db.commit()
@@ -99,7 +99,7 @@ async def process_document_task(document_id: int, file_path: str, fund_id: int):
         print(f"Error in background task: {e}")
         document = db.query(Document).filter(Document.id == document_id).first()
         if document:
-            document.parsing_status = "failed"
+            document.parsing_status = ParsingStatus.FAILED
             document.error_message = str(e)
             db.commit()
     finally:
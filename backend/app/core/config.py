@@ -45,12 +45,29 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
     
     # Document Processing
+    PDF_BACKEND: str = "pdfplumber"  # pdfplumber or pymupdf (faster; optional PyMuPDF, AGPL)
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
+    PDF_PARALLEL_MIN_PAGES: int = 20  # Extract pages in a worker pool above this size
+    PDF_PARALLEL_EXECUTOR: str = "process"  # process or thread (no pickling, overlaps I/O)
+    BULK_INSERT_BATCH_SIZE: int = 5000  # Parsed transaction rows per INSERT batch
     
+    # Embeddings
+    EMBEDDING_BATCH_SIZE: int = 64  # Texts per embedding request
+    EMBEDDING_CONCURRENCY: int = 16  # Embedding requests in flight at once
+    EMBEDDING_COPY_MIN_ROWS: int = 1000  # Load embeddings with COPY instead of INSERT from this many rows
+    LOCAL_EMBEDDING_RUNTIME: str = "torch"  # "torch" (sentence-transformers) or "onnx" (opt-in, needs fastembed)
+
     # RAG
     TOP_K_RESULTS: int = 5
     SIMILARITY_THRESHOLD: float = 0.7
+    SEARCH_CACHE_SIZE: int = 1024  # Cached similarity search results
+    SEARCH_CACHE_TTL: int = 600  # Seconds before a cached result expires
+    FUND_VECTOR_CACHE_MAX_ROWS: int = 5000  # Funds up to this size are searched in memory
+    FUND_VECTOR_CACHE_MAX_BYTES: int = 128 * 1024 * 1024  # Total size of cached fund embeddings
+    HNSW_M: int = 16  # Graph links per node in the HNSW index
+    HNSW_EF_CONSTRUCTION: int = 64  # Candidate list size while building the index
+    HNSW_EF_SEARCH: int = 40  # Candidate list size per search (recall vs latency)
     
     class Config:
         env_file = ".env"
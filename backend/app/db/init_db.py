@@ -2,7 +2,7 @@
 Database initialization
 """
 from app.db.base import Base
-from app.db.session import engine
+from app.db.session import engine, SessionLocal
 # Import models to ensure they are registered with SQLAlchemy
 from app.models.fund import Fund  # noqa: F401
 from app.models.transaction import CapitalCall, Distribution, Adjustment  # noqa: F401
@@ -12,8 +12,21 @@ from app.models.document import Document  # noqa: F401
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    init_vector_store()
     print("Database tables created successfully!")
 
 
+def init_vector_store():
+    """Create the pgvector extension, embeddings table and index"""
+    # Imported here so plain table creation does not load the embedding stack
+    from app.services.vector_store import VectorStore, ensure_vector_schema
+
+    db = SessionLocal()
+    try:
+        VectorStore._extension_ensured = ensure_vector_schema(db)
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
     init_db()
@@ -0,0 +1,72 @@
+"""
+Convert document_embeddings.embedding from vector to halfvec
+
+One-off migration for tables created before embeddings were stored as
+half precision. The ALTER rewrites the whole table under an ACCESS
+EXCLUSIVE lock, so run it during a maintenance window:
+
+    python -m app.db.migrate_halfvec
+
+Requires pgvector 0.7 or later. The HNSW index is rebuilt afterwards by
+ensure_vector_schema.
+"""
+import re
+import sys
+
+from sqlalchemy import text
+
+from app.db.session import SessionLocal
+
+
+def migrate_halfvec() -> bool:
+    """Convert the embedding column in place; returns True if the column is halfvec afterwards"""
+    # Imported here so the migration does not load the embedding stack until run
+    from app.services.vector_store import (
+        embedding_column_type,
+        embedding_dimension,
+        ensure_vector_schema,
+    )
+
+    db = SessionLocal()
+    try:
+        column_type = embedding_column_type(db)
+        if column_type is None:
+            print("document_embeddings does not exist; nothing to migrate")
+            return True
+        if column_type.startswith("halfvec"):
+            print(f"document_embeddings.embedding is already {column_type}")
+            return True
+
+        # The stored dimension must match the configured provider, otherwise
+        # the cast fails part way or new embeddings would not fit the column
+        dimension = embedding_dimension()
+        match = re.fullmatch(r"vector\((\d+)\)", column_type)
+        if match is None or int(match.group(1)) != dimension:
+            print(
+                f"document_embeddings.embedding is {column_type} but the configured "
+                f"provider uses {dimension} dimensions; not converting"
+            )
+            return False
+
+        db.execute(text(f"""
+        DROP INDEX IF EXISTS document_embeddings_embedding_idx;
+        DROP INDEX IF EXISTS document_embeddings_embedding_hnsw_idx;
+
+        ALTER TABLE document_embeddings
+        ALTER COLUMN embedding TYPE halfvec({dimension})
+        USING embedding::halfvec({dimension});
+        """))
+        db.commit()
+        print(f"Converted document_embeddings.embedding to halfvec({dimension})")
+
+        return ensure_vector_schema(db)
+    except Exception as e:
+        print(f"Error migrating document_embeddings to halfvec: {e}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if migrate_halfvec() else 1)
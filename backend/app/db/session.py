@@ -5,7 +5,12 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+engine_kwargs = {"pool_pre_ping": True, "insertmanyvalues_page_size": 1000}
+if settings.DATABASE_URL.startswith("postgresql"):
+    # Batch executemany() INSERTs into multi-row VALUES statements (psycopg2)
+    engine_kwargs["executemany_mode"] = "values_plus_batch"
+
+engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
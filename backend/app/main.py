@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.endpoints import documents, funds, chat, metrics
+from app.db.init_db import init_vector_store
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -30,6 +31,12 @@ app.include_router(chat.router, prefix="/api/chat", tags=["chat"])
 app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
 
 
+@app.on_event("startup")
+def create_vector_schema():
+    """Run the pgvector DDL once instead of in every VectorStore()"""
+    init_vector_store()
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
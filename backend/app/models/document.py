@@ -1,12 +1,22 @@
 """
 Document database model
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import enum
 from app.db.base import Base
 
 
+class ParsingStatus(str, enum.Enum):
+    """Document parsing status; compares equal to its string value"""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class Document(Base):
     """Document model"""
 
@@ -17,7 +27,11 @@ class Document(Base):
     file_name = Column(String(255), nullable=False)
     file_path = Column(String(500))
     upload_date = Column(DateTime, default=datetime.utcnow, index=True)
-    parsing_status = Column(String(50), default="pending", index=True)  # pending, processing, completed, failed
+    parsing_status = Column(
+        Enum(ParsingStatus, name="parsing_status", values_callable=lambda statuses: [s.value for s in statuses]),
+        default=ParsingStatus.PENDING,
+        index=True
+    )
     error_message = Column(Text)
 
     # Relationships
@@ -1,19 +1,34 @@
 """
 Transaction database models (Capital Calls, Distributions, Adjustments)
 """
-from sqlalchemy import Column, Integer, String, Date, Numeric, Boolean, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Date, Numeric, Boolean, Text, DateTime, ForeignKey, Index, func
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
 
 
-class CapitalCall(Base):
+class AmountCentsMixin:
+    """Adds amount_cents: the amount as a whole number of cents"""
+
+    @hybrid_property
+    def amount_cents(self):
+        return int(round(self.amount * 100))
+
+    @amount_cents.inplace.expression
+    @classmethod
+    def _amount_cents_expression(cls):
+        # Rounded before the cast, as SQLite may store amounts as REAL
+        return func.round(cls.amount * 100).cast(BigInteger)
+
+
+class CapitalCall(AmountCentsMixin, Base):
     """Capital Call model"""
 
     __tablename__ = "capital_calls"
 
     id = Column(Integer, primary_key=True, index=True)
-    fund_id = Column(Integer, ForeignKey("funds.id"), nullable=False, index=True)
+    fund_id = Column(Integer, ForeignKey("funds.id"), nullable=False)
     call_date = Column(Date, nullable=False, index=True)
     call_type = Column(String(100), index=True)
     amount = Column(Numeric(15, 2), nullable=False)
@@ -25,17 +40,19 @@ class CapitalCall(Base):
 
     # Indexes for performance
     __table_args__ = (
+        # Covers "WHERE fund_id = ? ORDER BY call_date" and SUM(amount) per fund
+        Index("ix_capital_calls_fund_id_call_date", "fund_id", "call_date", postgresql_include=["amount"]),
         {'sqlite_autoincrement': True},
     )
 
 
-class Distribution(Base):
+class Distribution(AmountCentsMixin, Base):
     """Distribution model"""
 
     __tablename__ = "distributions"
 
     id = Column(Integer, primary_key=True, index=True)
-    fund_id = Column(Integer, ForeignKey("funds.id"), nullable=False, index=True)
+    fund_id = Column(Integer, ForeignKey("funds.id"), nullable=False)
     distribution_date = Column(Date, nullable=False, index=True)
     distribution_type = Column(String(100), index=True)
     is_recallable = Column(Boolean, default=False, index=True)
@@ -48,17 +65,19 @@ class Distribution(Base):
 
     # Indexes for performance
     __table_args__ = (
+        # Covers "WHERE fund_id = ? ORDER BY distribution_date" and SUM(amount) per fund
+        Index("ix_distributions_fund_id_distribution_date", "fund_id", "distribution_date", postgresql_include=["amount"]),
         {'sqlite_autoincrement': True},
     )
 
 
-class Adjustment(Base):
+class Adjustment(AmountCentsMixin, Base):
     """Adjustment model"""
 
     __tablename__ = "adjustments"
 
     id = Column(Integer, primary_key=True, index=True)
-    fund_id = Column(Integer, ForeignKey("funds.id"), nullable=False, index=True)
+    fund_id = Column(Integer, ForeignKey("funds.id"), nullable=False)
     adjustment_date = Column(Date, nullable=False, index=True)
     adjustment_type = Column(String(100), index=True)
     category = Column(String(100))
@@ -72,5 +91,7 @@ class Adjustment(Base):
 
     # Indexes for performance
     __table_args__ = (
+        # Covers "WHERE fund_id = ? ORDER BY adjustment_date" and SUM(amount) per fund
+        Index("ix_adjustments_fund_id_adjustment_date", "fund_id", "adjustment_date", postgresql_include=["amount"]),
         {'sqlite_autoincrement': True},
     )
@@ -1,30 +1,180 @@
 """
-Document processing service using pdfplumber
+Document processing service using pdfplumber or PyMuPDF
 
 Implements the document processing pipeline:
-- Extract tables from PDF using pdfplumber
+- Extract tables from PDF using pdfplumber or PyMuPDF (PDF_BACKEND)
 - Classify tables (capital calls, distributions, adjustments)
 - Extract and chunk text for vector storage
 - Handle errors and edge cases
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, ContextManager, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+import asyncio
+from functools import lru_cache, partial
+import os
 import pdfplumber
 from app.core.config import settings
 from app.services.table_parser import TableParser
 from app.services.vector_store import VectorStore
 from app.models.transaction import CapitalCall, Distribution, Adjustment
-from app.models.document import Document
+from app.models.document import Document, ParsingStatus
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 import re
 
+# Import PyMuPDF if available
+try:
+    import fitz
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# Compiled once at import; used for every page and chunk
+_WHITESPACE_RE = re.compile(r'\s+')
+_PAGE_NUMBER_RE = re.compile(r'\bPage\s+\d+\s+of\s+\d+\b', re.IGNORECASE)
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+')
+# TableParser table type -> (model, processing stats key)
+_TRANSACTION_TABLES = {
+    "capital_call": (CapitalCall, "capital_calls"),
+    "distribution": (Distribution, "distributions"),
+    "adjustment": (Adjustment, "adjustments"),
+}
+
+_QUOTE_TRANSLATION = str.maketrans({
+    '\u201c': '"', '\u201d': '"',
+    '\u2018': "'", '\u2019': "'",
+})
+
+
+def _extract_pdfplumber_page(page) -> Tuple[List[List[List[str]]], Optional[str]]:
+    """
+    Extract tables and text from a single pdfplumber page
+
+    Both extractions reuse the page's cached layout objects, which are
+    flushed afterwards so memory stays bounded by one page.
+    """
+    try:
+        return page.extract_tables(), page.extract_text()
+    finally:
+        page.flush_cache()
+
+
+def _extract_pymupdf_page(page) -> Tuple[List[List[List[str]]], Optional[str]]:
+    """Extract tables and text from a single PyMuPDF page"""
+    tables = [table.extract() for table in page.find_tables().tables]
+    return tables, page.get_text("text")
+
+
+@contextmanager
+def _open_pdf_pages(file_path: str, backend: str, page_numbers: Optional[List[int]] = None):
+    """
+    Open a PDF with the given backend and yield (pages, extract_page)
+
+    Args:
+        file_path: Path to the PDF file
+        backend: 'pdfplumber' or 'pymupdf'
+        page_numbers: 1-based page numbers to open, or None for all pages
+    """
+    if backend == "pymupdf":
+        if not PYMUPDF_AVAILABLE:
+            raise ImportError(
+                "PyMuPDF not installed. "
+                "Install with: pip install PyMuPDF"
+            )
+
+        with fitz.open(file_path) as doc:
+            numbers = page_numbers or range(1, doc.page_count + 1)
+            yield [doc[page_num - 1] for page_num in numbers], _extract_pymupdf_page
+
+    elif backend == "pdfplumber":
+        with pdfplumber.open(file_path, pages=page_numbers) as pdf:
+            yield pdf.pages, _extract_pdfplumber_page
+
+    else:
+        raise ValueError(
+            f"Unknown PDF_BACKEND: {backend}. "
+            f"Supported values: pdfplumber, pymupdf"
+        )
+
+
+def _extract_page_range(file_path: str, page_numbers: List[int], backend: str) -> List[Tuple[Optional[Tuple], Optional[str]]]:
+    """
+    Pool worker: open the PDF once and extract a contiguous range of pages
+
+    Each worker uses its own file handle, since neither backend allows
+    pages of one open document to be parsed from several threads.
+
+    Returns one (extracted, error_message) pair per page so a failing page
+    doesn't discard the rest of the range.
+    """
+    results = []
+    with _open_pdf_pages(file_path, backend, page_numbers) as (pages, extract_page):
+        for page in pages:
+            try:
+                results.append((extract_page(page), None))
+            except Exception as e:
+                results.append((None, str(e)))
+    return results
+
+
+def _unpack_extraction(extracted: Optional[Tuple], error: Optional[str]) -> Tuple:
+    """Return a worker's extraction result, re-raising its per-page error"""
+    if error is not None:
+        raise RuntimeError(error)
+    return extracted
+
+
+@lru_cache(maxsize=8)
+def _make_chunker(chunk_size: int, chunk_overlap: int):
+    """
+    Build a sentence chunker with chunk_size and chunk_overlap fixed
+
+    The sizes are closure constants rather than attribute or settings
+    lookups; chunkers are cached per size pair.
+    """
+    def chunker(sentences: List[str]) -> List[str]:
+        # Create chunks as a sliding window over sentence offsets. With
+        # cum[i] the length of the first i sentences, chunk boundaries are
+        # found by bisection, so the loop runs once per chunk rather than
+        # once per sentence.
+        chunks = []
+        cum = [0, *accumulate(len(sentence) for sentence in sentences)]
+        sentence_count = len(sentences)
+        start = end = 0
+
+        while end < sentence_count:
+            # Always take the next sentence, then as many more as fit in
+            # chunk_size
+            end = max(end + 1, bisect_right(cum, cum[start] + chunk_size, lo=end + 1) - 1)
+            chunks.append(" ".join(sentences[start:end]))
+
+            # Start the next chunk with overlap: keep the trailing
+            # sentences that fit within chunk_overlap
+            if end < sentence_count:
+                start = bisect_left(cum, cum[end] - chunk_overlap, lo=start)
+
+        return chunks
+
+    return chunker
+
 
 class DocumentProcessor:
-    """Process PDF documents and extract structured data"""
+    """
+    Process PDF documents and extract structured data
+
+    pdf_opener, if given, opens a file path as a pdfplumber-like document
+    (a context manager with .pages) in place of the configured PDF_BACKEND.
+    """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, pdf_opener: Optional[Callable[[str], ContextManager[Any]]] = None):
         self.db = db
         self.table_parser = TableParser()
         self.vector_store = VectorStore(db)
+        self.pdf_opener = pdf_opener
+        self._chunker = _make_chunker(settings.CHUNK_SIZE, settings.CHUNK_OVERLAP)
 
     async def process_document(self, file_path: str, document_id: int, fund_id: int) -> Dict[str, Any]:
         """
@@ -56,52 +206,34 @@ class DocumentProcessor:
         }
 
         # Update document status to processing
-        doc = self.db.query(Document).filter(Document.id == document_id).first()
-        if doc:
-            doc.parsing_status = "processing"
-            self.db.commit()
+        self._set_status(document_id, ParsingStatus.PROCESSING)
 
         try:
-            # Open PDF with pdfplumber
-            with pdfplumber.open(file_path) as pdf:
+            # Parsed rows are buffered as plain dicts per table type and
+            # flushed with a multi-row INSERT every BULK_INSERT_BATCH_SIZE rows
+            row_buffers = {table_type: [] for table_type in _TRANSACTION_TABLES}
+
+            # Open PDF with the configured backend
+            backend = settings.PDF_BACKEND
+            with self._open_pages(file_path, backend) as (pages, extract_page):
                 all_text_content = []
 
                 # Process each page
-                for page_num, page in enumerate(pdf.pages, start=1):
+                async for page_num, extract in self._iter_page_extractions(pages, extract_page, file_path, backend):
                     try:
-                        # Extract tables
-                        tables = page.extract_tables()
+                        page_rows = {table_type: [] for table_type in _TRANSACTION_TABLES}
+
+                        # Extract tables and text
+                        tables, text = extract()
                         if tables:
                             stats["tables_found"] += len(tables)
 
                             for table in tables:
                                 # Parse and classify table
                                 result = self.table_parser.parse_table(table, fund_id)
+                                if result["type"] in page_rows:
+                                    page_rows[result["type"]].extend(result["data"])
 
-                                # Store parsed data in database
-                                if result["type"] == "capital_call":
-                                    for call_data in result["data"]:
-                                        capital_call = CapitalCall(**call_data)
-                                        self.db.add(capital_call)
-                                        stats["capital_calls"] += 1
-
-                                elif result["type"] == "distribution":
-                                    for dist_data in result["data"]:
-                                        distribution = Distribution(**dist_data)
-                                        self.db.add(distribution)
-                                        stats["distributions"] += 1
-
-                                elif result["type"] == "adjustment":
-                                    for adj_data in result["data"]:
-                                        adjustment = Adjustment(**adj_data)
-                                        self.db.add(adjustment)
-                                        stats["adjustments"] += 1
-
-                            # Commit after each page
-                            self.db.commit()
-
-                        # Extract text from page
-                        text = page.extract_text()
                         if text:
                             all_text_content.append({
                                 "text": text,
@@ -110,53 +242,154 @@ class DocumentProcessor:
                                 "fund_id": fund_id
                             })
 
-                        stats["pages_processed"] += 1
-
                     except Exception as e:
                         error_msg = f"Error processing page {page_num}: {str(e)}"
                         print(error_msg)
                         stats["errors"].append(error_msg)
                         continue
 
-                # Chunk text and store in vector database
+                    # Only keep rows from pages that were processed successfully.
+                    # Flushing stays outside the per-page handler so insert
+                    # errors fail the document instead of counting as page errors
+                    for table_type, rows in page_rows.items():
+                        buffer = row_buffers[table_type]
+                        buffer.extend(rows)
+                        if len(buffer) >= settings.BULK_INSERT_BATCH_SIZE:
+                            self._flush_rows(table_type, buffer, stats)
+
+                    stats["pages_processed"] += 1
+
+                # Store remaining parsed data and commit all batches together
+                for table_type, buffer in row_buffers.items():
+                    self._flush_rows(table_type, buffer, stats)
+                self.db.commit()
+
+                # Chunk text and store in vector database in one batch
                 if all_text_content:
                     chunks = self._chunk_text(all_text_content)
-                    for chunk in chunks:
+                    if chunks:
                         try:
-                            await self.vector_store.add_document(
-                                content=chunk["text"],
-                                metadata={
-                                    "document_id": chunk["document_id"],
-                                    "fund_id": chunk["fund_id"],
-                                    "page_number": chunk["page_number"],
-                                    "chunk_index": chunk.get("chunk_index", 0)
-                                }
+                            await self.vector_store.add_documents(
+                                texts=[chunk["text"] for chunk in chunks],
+                                metadatas=[
+                                    {
+                                        "document_id": chunk["document_id"],
+                                        "fund_id": chunk["fund_id"],
+                                        "page_number": chunk["page_number"],
+                                        "chunk_index": chunk.get("chunk_index", 0)
+                                    }
+                                    for chunk in chunks
+                                ]
                             )
-                            stats["text_chunks"] += 1
+                            stats["text_chunks"] = len(chunks)
                         except Exception as e:
-                            error_msg = f"Error storing text chunk: {str(e)}"
+                            error_msg = f"Error storing text chunks: {str(e)}"
                             print(error_msg)
                             stats["errors"].append(error_msg)
 
             # Update document status to completed
-            if doc:
-                doc.parsing_status = "completed"
-                self.db.commit()
+            self._set_status(document_id, ParsingStatus.COMPLETED)
 
             return stats
 
         except Exception as e:
             # Update document status to failed
-            if doc:
-                doc.parsing_status = "failed"
-                doc.error_message = str(e)
-                self.db.commit()
+            self.db.rollback()
+            self._set_status(document_id, ParsingStatus.FAILED, error_message=str(e))
 
             error_msg = f"Error processing document: {str(e)}"
             print(error_msg)
             stats["errors"].append(error_msg)
             raise
 
+    def _set_status(self, document_id: int, status: ParsingStatus, error_message: Optional[str] = None):
+        """Update parsing status with a single UPDATE, without loading the Document row"""
+        values = {"parsing_status": status}
+        if error_message is not None:
+            values["error_message"] = error_message
+
+        self.db.execute(update(Document).where(Document.id == document_id).values(**values))
+        self.db.commit()
+
+    @contextmanager
+    def _open_pages(self, file_path: str, backend: str):
+        """Open the PDF with pdf_opener if one was given, else with backend"""
+        if self.pdf_opener is None:
+            with _open_pdf_pages(file_path, backend) as opened:
+                yield opened
+            return
+
+        with self.pdf_opener(file_path) as pdf:
+            yield pdf.pages, _extract_pdfplumber_page
+
+    async def _iter_page_extractions(self, pages: List[Any], extract_page, file_path: str, backend: str):
+        """
+        Yield (page_number, extract) pairs where extract() returns (tables, text)
+
+        Large documents are extracted in a worker pool. A process pool
+        (default) parallelises the CPU-bound parsing; a thread pool
+        (PDF_PARALLEL_EXECUTOR=thread) avoids pickling results and overlaps
+        file reads and stream decompression, which release the GIL. Each
+        worker opens the PDF once and handles a contiguous page range.
+        Small documents are extracted in-process to avoid the pool startup
+        cost, as are documents from an injected pdf_opener, which workers
+        could not reopen. Pool results are awaited so the event loop keeps
+        running while a batch is extracted. Errors surface when extract()
+        is called so they can be handled per page.
+        """
+        page_count = len(pages)
+
+        if self.pdf_opener is not None or page_count < settings.PDF_PARALLEL_MIN_PAGES:
+            for page_num, page in enumerate(pages, start=1):
+                yield page_num, partial(extract_page, page)
+            return
+
+        max_workers = min(os.cpu_count() or 1, page_count)
+        range_size = -(-page_count // max_workers)
+        page_ranges = [
+            list(range(start, min(start + range_size, page_count + 1)))
+            for start in range(1, page_count + 1, range_size)
+        ]
+
+        if settings.PDF_PARALLEL_EXECUTOR == "thread":
+            executor_class = ThreadPoolExecutor
+        else:
+            executor_class = ProcessPoolExecutor
+
+        # shutdown(wait=True) would block the event loop, so the pool is shut
+        # down without waiting; every future is awaited or cancelled first
+        executor = executor_class(max_workers=max_workers)
+        try:
+            futures = [
+                executor.submit(_extract_page_range, file_path, page_numbers, backend)
+                for page_numbers in page_ranges
+            ]
+            for future, page_numbers in zip(futures, page_ranges):
+                try:
+                    results = await asyncio.wrap_future(future)
+                except Exception as e:
+                    results = [(None, str(e))] * len(page_numbers)
+
+                for page_num, (extracted, error) in zip(page_numbers, results):
+                    yield page_num, partial(_unpack_extraction, extracted, error)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _flush_rows(self, table_type: str, rows: List[Dict[str, Any]], stats: Dict[str, Any]):
+        """
+        Insert buffered rows using a Core executemany instead of per-row ORM add()
+
+        The buffer is cleared and the matching stats counter updated. Rows are
+        committed by the caller once the whole document has been parsed.
+        """
+        if not rows:
+            return
+
+        model, stats_key = _TRANSACTION_TABLES[table_type]
+        self.db.execute(insert(model), rows)
+        stats[stats_key] += len(rows)
+        rows.clear()
+
     def _chunk_text(self, text_content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Chunk text content for vector storage
@@ -173,8 +406,6 @@ class DocumentProcessor:
             List of text chunks with metadata
         """
         chunks = []
-        chunk_size = settings.CHUNK_SIZE
-        chunk_overlap = settings.CHUNK_OVERLAP
 
         for content in text_content:
             text = content["text"]
@@ -192,69 +423,39 @@ class DocumentProcessor:
             # Split into sentences for better chunking
             sentences = self._split_into_sentences(text)
 
-            # Create chunks
-            current_chunk = []
-            current_length = 0
-            chunk_index = 0
-
-            for sentence in sentences:
-                sentence_length = len(sentence)
-
-                # If adding this sentence exceeds chunk size, save current chunk
-                if current_length + sentence_length > chunk_size and current_chunk:
-                    chunk_text = " ".join(current_chunk)
-                    chunks.append({
-                        "text": chunk_text,
-                        "page_number": page_number,
-                        "document_id": document_id,
-                        "fund_id": fund_id,
-                        "chunk_index": chunk_index
-                    })
-                    chunk_index += 1
-
-                    # Start new chunk with overlap
-                    overlap_text = chunk_text[-chunk_overlap:] if len(chunk_text) > chunk_overlap else chunk_text
-                    overlap_sentences = self._split_into_sentences(overlap_text)
-                    current_chunk = overlap_sentences
-                    current_length = len(overlap_text)
-
-                # Add sentence to current chunk
-                current_chunk.append(sentence)
-                current_length += sentence_length
-
-            # Add remaining chunk
-            if current_chunk:
-                chunk_text = " ".join(current_chunk)
-                chunks.append({
+            page_chunks = self._chunker(sentences)
+
+            # Attach metadata; extending with a sized list grows chunks once per page
+            chunks.extend([
+                {
                     "text": chunk_text,
                     "page_number": page_number,
                     "document_id": document_id,
                     "fund_id": fund_id,
                     "chunk_index": chunk_index
-                })
+                }
+                for chunk_index, chunk_text in enumerate(page_chunks)
+            ])
 
         return chunks
 
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
 
         # Remove page numbers and common PDF artifacts
-        text = re.sub(r'\bPage\s+\d+\s+of\s+\d+\b', '', text, flags=re.IGNORECASE)
+        text = _PAGE_NUMBER_RE.sub('', text)
 
         # Normalize quotes
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
+        text = text.translate(_QUOTE_TRANSLATION)
 
         return text.strip()
 
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences"""
         # Simple sentence splitting (can be improved with NLTK or spaCy)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-
-        # Filter out empty sentences
-        sentences = [s.strip() for s in sentences if s.strip()]
+        sentences = _SENTENCE_BOUNDARY_RE.split(text)
 
-        return sentences
+        # Filter out empty sentences, stripping each one once
+        return [stripped for s in sentences if (stripped := s.strip())]
@@ -1,14 +1,162 @@
 """
 Fund metrics calculator service
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from decimal import Decimal
 import numpy as np
 import numpy_financial as npf
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, literal, select, union_all
 from app.models.transaction import CapitalCall, Distribution, Adjustment
 
+# Import Numba if available
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _newton_log_rate(amounts: np.ndarray, periods: np.ndarray, tol: float, max_iter: int) -> float:
+    """Newton iteration for _irr_newton; returns x = log(1 + r), or nan without convergence"""
+    weighted = periods * amounts
+    x = 0.0
+    with np.errstate(over="ignore", invalid="ignore"):
+        for _ in range(max_iter):
+            discount = np.exp(-periods * x)
+            step = (amounts @ discount) / -(weighted @ discount)
+            if not np.isfinite(step):
+                break
+            x -= step
+            if abs(step) < tol:
+                return x
+    return np.nan
+
+
+if NUMBA_AVAILABLE:
+    # Same iteration as one fused loop per step, compiled on first use and
+    # cached on disk. numpy's error model turns division by zero into inf.
+    @njit(cache=True, error_model="numpy")
+    def _newton_log_rate(amounts, periods, tol, max_iter):
+        x = 0.0
+        for _ in range(max_iter):
+            npv = 0.0
+            dnpv = 0.0
+            for i in range(amounts.size):
+                term = amounts[i] * np.exp(-periods[i] * x)
+                npv += term
+                dnpv -= periods[i] * term
+            step = npv / dnpv
+            if not np.isfinite(step):
+                break
+            x -= step
+            if abs(step) < tol:
+                return x
+        return np.nan
+
+
+def _irr_newton(amounts: np.ndarray, tol: float = 1e-9, max_iter: int = 50) -> float:
+    """
+    Solve NPV(r) = 0 over per-period cash flows with Newton-Raphson
+
+    Uses the same period-indexed NPV as npf.irr at O(n) per iteration,
+    instead of npf.irr's O(n^3) eigenvalue root finding. Only series whose
+    amounts change sign once are solved: those have exactly one IRR, so the
+    result matches npf.irr's. Returns nan otherwise or when the iteration
+    does not converge.
+    """
+    nonzero = np.flatnonzero(amounts)
+    signs = np.sign(amounts[nonzero])
+    changes = np.flatnonzero(signs[1:] != signs[:-1])
+    if len(changes) != 1:
+        return np.nan
+
+    # Iterate on x = log(1 + r) with periods counted from the sign change.
+    # NPV scaled that way is monotonic in x, so Newton converges from x = 0.
+    periods = np.arange(len(amounts), dtype=np.float64) - nonzero[changes[0] + 1]
+    return float(np.expm1(_newton_log_rate(amounts, periods, tol, max_iter)))
+
+
+def _sign_changes(values: np.ndarray) -> int:
+    """Number of sign changes in values, skipping zeros"""
+    signs = np.sign(values)
+    signs = signs[signs != 0]
+    return int(np.count_nonzero(signs[1:] != signs[:-1]))
+
+
+def _bisect_log_root(
+    log_abs: np.ndarray, signs: np.ndarray, lo: float, hi: float, tol: float = 1e-13, max_iter: int = 200
+) -> float:
+    """
+    Bisect for the sign change of sum(signs * exp(log_abs + i * u)) in u on [lo, hi]
+
+    Each evaluation is scaled by its largest term, so long series do not
+    overflow; only the sign is used.
+    """
+    powers = np.arange(len(log_abs), dtype=np.float64)
+
+    def sign_at(u):
+        terms = log_abs + powers * u
+        return np.sign(signs @ np.exp(terms - terms.max()))
+
+    sign_lo = sign_at(lo)
+    for _ in range(max_iter):
+        mid = 0.5 * (lo + hi)
+        if hi - lo < tol:
+            break
+        sign_mid = sign_at(mid)
+        if sign_mid == 0:
+            return mid
+        if sign_mid == sign_lo:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+
+def _irr_bracketed(amounts: np.ndarray) -> Optional[float]:
+    """
+    npf.irr's root for series whose cumulative sums change sign at most once
+
+    With x = 1 / (1 + r), NPV is a polynomial in x. By Descartes' rule
+    applied to its cumulative sums (Norstrom's criterion), the sign changes
+    of the forward cumulative sums bound the roots with r > 0, and those of
+    the backward sums bound the roots with r < 0. When each count is at
+    most one, each side has exactly that many roots, so bisecting each
+    bracket in log(x) finds every positive root at O(n) per step. The one
+    closest to zero is returned, as npf.irr does, or nan when there is
+    none. Returns None when either count is above one and the series needs
+    npf.irr's full root finding.
+    """
+    nonzero = np.flatnonzero(amounts)
+    if not len(nonzero):
+        return np.nan
+    flows = amounts[nonzero[0]:nonzero[-1] + 1]
+
+    roots_above_zero = _sign_changes(np.cumsum(flows))
+    roots_below_zero = _sign_changes(np.cumsum(flows[::-1]))
+    if roots_above_zero > 1 or roots_below_zero > 1:
+        return None
+    if flows.sum() == 0:
+        return 0.0
+
+    magnitudes = np.abs(flows)
+    with np.errstate(divide="ignore"):
+        log_abs = np.log(magnitudes)
+    signs = np.sign(flows)
+
+    # Cauchy bounds on the roots in x bracket each side
+    rates = []
+    if roots_above_zero:
+        lower = np.log(magnitudes[0] / (magnitudes[0] + magnitudes[1:].max()))
+        rates.append(np.expm1(-_bisect_log_root(log_abs, signs, lower, 0.0)))
+    if roots_below_zero:
+        upper = np.log1p(magnitudes[:-1].max() / magnitudes[-1])
+        rates.append(np.expm1(-_bisect_log_root(log_abs, signs, 0.0, upper)))
+    if not rates:
+        return np.nan
+    return float(min(rates, key=abs))
+
 
 class MetricsCalculator:
     """Calculate fund performance metrics"""
@@ -18,9 +166,9 @@ class MetricsCalculator:
     
     def calculate_all_metrics(self, fund_id: int) -> Dict[str, Any]:
         """Calculate all metrics for a fund"""
-        pic = self.calculate_pic(fund_id)
-        total_distributions = self.calculate_total_distributions(fund_id)
-        dpi = self.calculate_dpi(fund_id)
+        total_calls, total_distributions, total_adjustments = self._get_totals(fund_id)
+        pic = self._pic(total_calls, total_adjustments)
+        dpi = self._dpi(total_distributions, pic)
         irr = self.calculate_irr(fund_id)
         
         return {
@@ -38,29 +186,36 @@ class MetricsCalculator:
         Calculate Paid-In Capital (PIC)
         PIC = Total Capital Calls - Adjustments
         """
-        # Get total capital calls
-        total_calls = self.db.query(
-            func.sum(CapitalCall.amount)
-        ).filter(
-            CapitalCall.fund_id == fund_id
-        ).scalar() or Decimal(0)
-        
-        # Get total adjustments
-        total_adjustments = self.db.query(
-            func.sum(Adjustment.amount)
-        ).filter(
-            Adjustment.fund_id == fund_id
-        ).scalar() or Decimal(0)
-        
+        # Total capital calls and adjustments, read in one query
+        total_calls, total_adjustments = self._get_totals(fund_id, (CapitalCall, Adjustment))
+        return self._pic(total_calls, total_adjustments)
+    
+    @staticmethod
+    def _pic(total_calls: Decimal, total_adjustments: Decimal) -> Decimal:
+        """PIC from summed capital calls and adjustments, floored at zero"""
         pic = total_calls - total_adjustments
         return pic if pic > 0 else Decimal(0)
     
+    def _get_totals(
+        self, fund_id: int, models: Tuple[type, ...] = (CapitalCall, Distribution, Adjustment)
+    ) -> Tuple[Decimal, ...]:
+        """
+        Sum the amounts of each transaction model in one query
+        
+        Each total is a scalar subquery, so the tables are not joined
+        against each other. Returns the totals in the order of models,
+        by default (calls, distributions, adjustments).
+        """
+        totals = self.db.execute(select(*(
+            select(func.sum(model.amount)).where(model.fund_id == fund_id).scalar_subquery()
+            for model in models
+        ))).one()
+        return tuple(total or Decimal(0) for total in totals)
+    
     def calculate_total_distributions(self, fund_id: int) -> Optional[Decimal]:
         """Calculate total distributions"""
-        total = self.db.query(
-            func.sum(Distribution.amount)
-        ).filter(
-            Distribution.fund_id == fund_id
+        total = self.db.execute(
+            select(func.sum(Distribution.amount)).where(Distribution.fund_id == fund_id)
         ).scalar() or Decimal(0)
         
         return total
@@ -70,9 +225,12 @@ class MetricsCalculator:
         Calculate DPI (Distribution to Paid-In)
         DPI = Cumulative Distributions / PIC
         """
-        pic = self.calculate_pic(fund_id)
-        total_distributions = self.calculate_total_distributions(fund_id)
-        
+        total_calls, total_distributions, total_adjustments = self._get_totals(fund_id)
+        return self._dpi(total_distributions, self._pic(total_calls, total_adjustments))
+    
+    @staticmethod
+    def _dpi(total_distributions: Decimal, pic: Decimal) -> float:
+        """DPI from total distributions and PIC; 0.0 when nothing is paid in"""
         if not pic or pic == 0:
             return 0.0
         
@@ -82,20 +240,32 @@ class MetricsCalculator:
     def calculate_irr(self, fund_id: int) -> Optional[float]:
         """
         Calculate IRR (Internal Rate of Return)
-        Uses numpy-financial's irr function
+        Uses Newton-Raphson or bracketed bisection, falling back to
+        numpy-financial's irr function
         """
         try:
-            # Get all cash flows sorted by date
-            cash_flows = self._get_cash_flows(fund_id)
+            # Get all cash flow amounts sorted by date
+            return self._irr(self._get_cash_flow_amounts(fund_id))
             
-            if len(cash_flows) < 2:
+        except Exception as e:
+            print(f"Error calculating IRR: {e}")
+            return None
+    
+    @staticmethod
+    def _irr(amounts: np.ndarray) -> Optional[float]:
+        """IRR as a percentage from date-ordered cash flow amounts"""
+        try:
+            if len(amounts) < 2:
                 return None
             
-            # Extract amounts
-            amounts = [cf['amount'] for cf in cash_flows]
-            
             # Calculate IRR (returns as decimal, e.g., 0.15 for 15%)
-            irr = npf.irr(amounts)
+            irr = _irr_newton(amounts)
+            if np.isnan(irr):
+                # Several sign changes or no convergence; bracket the roots
+                # when the cumulative sums allow it, else use numpy-financial's
+                irr = _irr_bracketed(amounts)
+                if irr is None:
+                    irr = npf.irr(amounts)
             
             if irr is None or np.isnan(irr) or np.isinf(irr):
                 return None
@@ -107,51 +277,58 @@ class MetricsCalculator:
             print(f"Error calculating IRR: {e}")
             return None
     
-    def _get_cash_flows(self, fund_id: int) -> list:
-        """
-        Get all cash flows for IRR calculation
-        Capital calls are negative, distributions are positive
+    def _get_cash_flow_rows(self, fund_id: int) -> list:
         """
-        cash_flows = []
-        
-        # Get capital calls (negative cash flows)
-        calls = self.db.query(
-            CapitalCall.call_date,
-            CapitalCall.amount
-        ).filter(
-            CapitalCall.fund_id == fund_id
-        ).order_by(
-            CapitalCall.call_date
-        ).all()
-        
-        for call in calls:
-            cash_flows.append({
-                'date': call.call_date,
-                'amount': -float(call.amount),  # Negative for outflow
-                'type': 'capital_call'
-            })
+        Get (date, amount_cents, kind, id) rows for both cash flow types in one query
         
-        # Get distributions (positive cash flows)
-        distributions = self.db.query(
+        kind is 0 for capital calls and 1 for distributions; amounts are
+        unsigned whole cents, read as integers rather than Decimal. Rows are
+        ordered by date with capital calls ahead of distributions on the
+        same date, then by id.
+        """
+        calls = select(
+            CapitalCall.call_date.label("flow_date"),
+            CapitalCall.amount_cents.label("amount_cents"),
+            literal(0).label("kind"),
+            CapitalCall.id,
+        ).where(CapitalCall.fund_id == fund_id)
+        distributions = select(
             Distribution.distribution_date,
-            Distribution.amount
-        ).filter(
-            Distribution.fund_id == fund_id
-        ).order_by(
-            Distribution.distribution_date
-        ).all()
+            Distribution.amount_cents.label("amount_cents"),
+            literal(1),
+            Distribution.id,
+        ).where(Distribution.fund_id == fund_id)
         
-        for dist in distributions:
-            cash_flows.append({
-                'date': dist.distribution_date,
-                'amount': float(dist.amount),  # Positive for inflow
-                'type': 'distribution'
-            })
-        
-        # Sort by date
-        cash_flows.sort(key=lambda x: x['date'])
+        return self.db.execute(
+            union_all(calls, distributions).order_by("flow_date", "kind", "id")
+        ).all()
+    
+    def _get_cash_flow_amounts(self, fund_id: int) -> np.ndarray:
+        """
+        Get cash flow amounts for IRR calculation as a float64 array ordered by date
+        Capital calls are negative, distributions are positive
+        """
+        rows = self._get_cash_flow_rows(fund_id)
         
-        return cash_flows
+        # IRR is unchanged by scaling every flow, so cents are used as they are
+        amounts = np.fromiter((cents for _, cents, _, _ in rows), dtype=np.float64, count=len(rows))
+        kinds = np.fromiter((kind for _, _, kind, _ in rows), dtype=np.int8, count=len(rows))
+        amounts[kinds == 0] *= -1  # Negative for outflow
+        return amounts
+    
+    def _get_cash_flows(self, fund_id: int) -> list:
+        """
+        Get all cash flows for IRR calculation
+        Capital calls are negative, distributions are positive
+        """
+        return [
+            {
+                'date': flow_date,
+                'amount': -cents / 100 if kind == 0 else cents / 100,
+                'type': 'capital_call' if kind == 0 else 'distribution'
+            }
+            for flow_date, cents, kind, _ in self._get_cash_flow_rows(fund_id)
+        ]
     
     def get_calculation_breakdown(self, fund_id: int, metric: str) -> Dict[str, Any]:
         """
@@ -218,7 +395,10 @@ class MetricsCalculator:
         
         elif metric == "irr":
             cash_flows = self._get_cash_flows(fund_id)
-            irr = self.calculate_irr(fund_id)
+            # Same date-ordered flows calculate_irr would fetch again
+            irr = self._irr(np.fromiter(
+                (cf['amount'] for cf in cash_flows), dtype=np.float64, count=len(cash_flows)
+            ))
             
             return {
                 "metric": "IRR",
@@ -1,12 +1,15 @@
 """
 Query engine service for RAG-based question answering
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
+from functools import lru_cache
+import re
 import time
 import os
 from langchain_openai import ChatOpenAI
 from langchain_community.llms import Ollama
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.messages import BaseMessage
 from app.core.config import settings
 from app.services.vector_store import VectorStore
 from app.services.metrics_calculator import MetricsCalculator
@@ -21,9 +24,134 @@ except ImportError:
     print("Warning: langchain-google-genai not installed. Install with: pip install langchain-google-genai")
 
 
+def _keyword_pattern(keywords: List[str]) -> "re.Pattern[str]":
+    """Compile keywords into one alternation that matches any of them as a substring"""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+# Intent keyword patterns, checked in priority order
+_CALCULATION_RE = _keyword_pattern([
+    "calculate", "what is the", "current", "dpi", "irr", "tvpi",
+    "rvpi", "pic", "paid-in capital", "return", "performance"
+])
+_DEFINITION_RE = _keyword_pattern([
+    "what does", "mean", "define", "explain", "definition",
+    "what is a", "what are"
+])
+_RETRIEVAL_RE = _keyword_pattern([
+    "show me", "list", "all", "find", "search", "when",
+    "how many", "which"
+])
+
+
+def _make_gemini(model: str):
+    """Google Gemini (free tier available)"""
+    google_api_key = os.getenv("GOOGLE_API_KEY")
+    if not google_api_key:
+        raise ValueError("GOOGLE_API_KEY not found in environment variables")
+
+    if not GEMINI_AVAILABLE:
+        raise ImportError(
+            "langchain-google-genai not installed. "
+            "Install with: pip install langchain-google-genai"
+        )
+
+    print("Initializing Google Gemini LLM...")
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=google_api_key,
+        temperature=0,
+        convert_system_message_to_human=True  # Gemini compatibility
+    )
+
+
+def _make_openai(model: str):
+    """OpenAI GPT models (paid)"""
+    if not settings.OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY not found in environment variables")
+
+    print("Initializing OpenAI LLM...")
+    return ChatOpenAI(
+        model=model,
+        temperature=0,
+        openai_api_key=settings.OPENAI_API_KEY
+    )
+
+
+def _make_ollama(model: str):
+    """Local Ollama models (free, offline)"""
+    ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+
+    print(f"Initializing Ollama LLM (model: {model})...")
+    return Ollama(
+        model=model,
+        base_url=ollama_base_url
+    )
+
+
+_PROVIDER_FACTORIES = {
+    "gemini": _make_gemini,
+    "openai": _make_openai,
+    "ollama": _make_ollama,
+}
+
+
+def _provider_model(provider: str) -> Optional[str]:
+    """Resolve the model name configured for a provider"""
+    if provider == "gemini":
+        return "models/gemini-2.5-flash"  # Latest Gemini Flash model
+    if provider == "openai":
+        return settings.OPENAI_MODEL
+    if provider == "ollama":
+        return os.getenv("OLLAMA_MODEL", "llama3.2")
+    return None
+
+
+@lru_cache(maxsize=None)
+def _get_llm(provider: str, model: Optional[str]):
+    """Build the LLM client for a provider; cached so it is created once per (provider, model)"""
+    factory = _PROVIDER_FACTORIES.get(provider)
+    if factory is None:
+        raise ValueError(
+            f"Unknown LLM_PROVIDER: {provider}. "
+            f"Supported values: gemini, openai, ollama"
+        )
+    return factory(model)
+
+
 class QueryEngine:
     """RAG-based query engine for fund analysis"""
     
+    # Parsed once and shared by every query
+    _PROMPT = ChatPromptTemplate.from_messages([
+        ("system", """You are a financial analyst assistant specializing in private equity fund performance.
+
+Your role:
+- Answer questions about fund performance using provided context
+- Calculate metrics like DPI, IRR when asked
+- Explain complex financial terms in simple language
+- Always cite your sources from the provided documents
+
+When calculating:
+- Use the provided metrics data
+- Show your work step-by-step
+- Explain any assumptions made
+
+Format your responses:
+- Be concise but thorough
+- Use bullet points for lists
+- Bold important numbers using **number**
+- Provide context for metrics"""),
+        ("user", """Context from documents:
+{context}
+{metrics}
+{history}
+
+Question: {query}
+
+Please provide a helpful answer based on the context and metrics provided.""")
+    ])
+    
     def __init__(self, db: Session):
         self.db = db
         self.vector_store = VectorStore()
@@ -34,61 +162,11 @@ class QueryEngine:
         """
         Initialize LLM based on LLM_PROVIDER environment variable
 
-        Supported providers:
-        - gemini: Google Gemini (free tier available)
-        - openai: OpenAI GPT models (paid)
-        - ollama: Local Ollama models (free, offline)
+        The client is built once per (provider, model) and shared by all
+        QueryEngine instances.
         """
         llm_provider = os.getenv("LLM_PROVIDER", "openai").lower()
-
-        # Google Gemini
-        if llm_provider == "gemini":
-            google_api_key = os.getenv("GOOGLE_API_KEY")
-            if not google_api_key:
-                raise ValueError("GOOGLE_API_KEY not found in environment variables")
-
-            if not GEMINI_AVAILABLE:
-                raise ImportError(
-                    "langchain-google-genai not installed. "
-                    "Install with: pip install langchain-google-genai"
-                )
-
-            print("Initializing Google Gemini LLM...")
-            return ChatGoogleGenerativeAI(
-                model="models/gemini-2.5-flash",  # Latest Gemini Flash model
-                google_api_key=google_api_key,
-                temperature=0,
-                convert_system_message_to_human=True  # Gemini compatibility
-            )
-
-        # OpenAI
-        elif llm_provider == "openai":
-            if not settings.OPENAI_API_KEY:
-                raise ValueError("OPENAI_API_KEY not found in environment variables")
-
-            print("Initializing OpenAI LLM...")
-            return ChatOpenAI(
-                model=settings.OPENAI_MODEL,
-                temperature=0,
-                openai_api_key=settings.OPENAI_API_KEY
-            )
-
-        # Ollama (local)
-        elif llm_provider == "ollama":
-            ollama_model = os.getenv("OLLAMA_MODEL", "llama3.2")
-            ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-
-            print(f"Initializing Ollama LLM (model: {ollama_model})...")
-            return Ollama(
-                model=ollama_model,
-                base_url=ollama_base_url
-            )
-
-        else:
-            raise ValueError(
-                f"Unknown LLM_PROVIDER: {llm_provider}. "
-                f"Supported values: gemini, openai, ollama"
-            )
+        return _get_llm(llm_provider, _provider_model(llm_provider))
     
     async def process_query(
         self, 
@@ -109,21 +187,8 @@ class QueryEngine:
         """
         start_time = time.time()
         
-        # Step 1: Classify query intent
-        intent = await self._classify_intent(query)
-        
-        # Step 2: Retrieve relevant context from vector store
-        filter_metadata = {"fund_id": fund_id} if fund_id else None
-        relevant_docs = await self.vector_store.similarity_search(
-            query=query,
-            k=settings.TOP_K_RESULTS,
-            filter_metadata=filter_metadata
-        )
-        
-        # Step 3: Calculate metrics if needed
-        metrics = None
-        if intent == "calculation" and fund_id:
-            metrics = self.metrics_calculator.calculate_all_metrics(fund_id)
+        # Steps 1-3: Classify intent, retrieve context, calculate metrics
+        relevant_docs, metrics = await self._retrieve_context(query, fund_id)
         
         # Step 4: Generate response using LLM
         answer = await self._generate_response(
@@ -140,10 +205,7 @@ class QueryEngine:
             "sources": [
                 {
                     "content": doc["content"],
-                    "metadata": {
-                        k: v for k, v in doc.items() 
-                        if k not in ["content", "score"]
-                    },
+                    "metadata": doc.get("metadata") or {},  # Chunk metadata stored with the embedding
                     "score": doc.get("score")
                 }
                 for doc in relevant_docs
@@ -152,6 +214,69 @@ class QueryEngine:
             "processing_time": round(processing_time, 2)
         }
     
+    async def stream_query(
+        self,
+        query: str,
+        fund_id: Optional[int] = None,
+        conversation_history: List[Dict[str, str]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Process a user query using RAG and stream the answer
+        
+        Retrieval and metrics run before this returns, so database work is
+        finished while the request's session is still open; only the LLM
+        generation is streamed.
+        
+        Args:
+            query: User question
+            fund_id: Optional fund ID for context
+            conversation_history: Previous conversation messages
+            
+        Returns:
+            Async iterator of answer text fragments
+        """
+        relevant_docs, metrics = await self._retrieve_context(query, fund_id)
+        
+        messages = self._build_messages(
+            query=query,
+            context=relevant_docs,
+            metrics=metrics,
+            conversation_history=conversation_history or []
+        )
+        return self._stream_response(messages)
+    
+    async def _stream_response(self, messages: List[BaseMessage]) -> AsyncIterator[str]:
+        """Stream LLM output fragments as they are generated"""
+        try:
+            async for chunk in self.llm.astream(messages):
+                yield chunk.content if hasattr(chunk, 'content') else str(chunk)
+        except Exception as e:
+            yield f"I apologize, but I encountered an error generating a response: {str(e)}"
+    
+    async def _retrieve_context(
+        self,
+        query: str,
+        fund_id: Optional[int]
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Classify intent, retrieve relevant documents and calculate metrics if needed"""
+        # Step 1: Classify query intent
+        intent = await self._classify_intent(query)
+        
+        # Step 2: Retrieve relevant context from vector store
+        filter_metadata = {"fund_id": fund_id} if fund_id else None
+        relevant_docs = await self.vector_store.similarity_search(
+            query=query,
+            k=settings.TOP_K_RESULTS,
+            filter_metadata=filter_metadata
+        )
+        
+        # Step 3: Calculate metrics if needed
+        metrics = None
+        if intent == "calculation" and fund_id:
+            metrics = self.metrics_calculator.calculate_all_metrics(fund_id)
+        
+        return relevant_docs, metrics
+    
     async def _classify_intent(self, query: str) -> str:
         """
         Classify query intent
@@ -160,29 +285,14 @@ class QueryEngine:
             'calculation', 'definition', 'retrieval', or 'general'
         """
         query_lower = query.lower()
-        
-        # Calculation keywords
-        calc_keywords = [
-            "calculate", "what is the", "current", "dpi", "irr", "tvpi", 
-            "rvpi", "pic", "paid-in capital", "return", "performance"
-        ]
-        if any(keyword in query_lower for keyword in calc_keywords):
+
+        if _CALCULATION_RE.search(query_lower):
             return "calculation"
-        
-        # Definition keywords
-        def_keywords = [
-            "what does", "mean", "define", "explain", "definition", 
-            "what is a", "what are"
-        ]
-        if any(keyword in query_lower for keyword in def_keywords):
+
+        if _DEFINITION_RE.search(query_lower):
             return "definition"
-        
-        # Retrieval keywords
-        ret_keywords = [
-            "show me", "list", "all", "find", "search", "when", 
-            "how many", "which"
-        ]
-        if any(keyword in query_lower for keyword in ret_keywords):
+
+        if _RETRIEVAL_RE.search(query_lower):
             return "retrieval"
         
         return "general"
@@ -194,7 +304,25 @@ class QueryEngine:
         metrics: Optional[Dict[str, Any]],
         conversation_history: List[Dict[str, str]]
     ) -> str:
-        """Generate response using LLM"""
+        """Generate response using LLM without blocking the event loop"""
+        messages = self._build_messages(query, context, metrics, conversation_history)
+        
+        try:
+            response = await self.llm.ainvoke(messages)
+            if hasattr(response, 'content'):
+                return response.content
+            return str(response)
+        except Exception as e:
+            return f"I apologize, but I encountered an error generating a response: {str(e)}"
+    
+    def _build_messages(
+        self,
+        query: str,
+        context: List[Dict[str, Any]],
+        metrics: Optional[Dict[str, Any]],
+        conversation_history: List[Dict[str, str]]
+    ) -> List[BaseMessage]:
+        """Build prompt messages from retrieved context, metrics and history"""
         
         # Build context string
         context_str = "\n\n".join([
@@ -217,48 +345,9 @@ class QueryEngine:
             for msg in conversation_history[-3:]:  # Last 3 messages
                 history_str += f"{msg['role']}: {msg['content']}\n"
         
-        # Create prompt
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a financial analyst assistant specializing in private equity fund performance.
-
-Your role:
-- Answer questions about fund performance using provided context
-- Calculate metrics like DPI, IRR when asked
-- Explain complex financial terms in simple language
-- Always cite your sources from the provided documents
-
-When calculating:
-- Use the provided metrics data
-- Show your work step-by-step
-- Explain any assumptions made
-
-Format your responses:
-- Be concise but thorough
-- Use bullet points for lists
-- Bold important numbers using **number**
-- Provide context for metrics"""),
-            ("user", """Context from documents:
-{context}
-{metrics}
-{history}
-
-Question: {query}
-
-Please provide a helpful answer based on the context and metrics provided.""")
-        ])
-        
-        # Generate response
-        messages = prompt.format_messages(
+        return self._PROMPT.format_messages(
             context=context_str,
             metrics=metrics_str,
             history=history_str,
             query=query
         )
-        
-        try:
-            response = self.llm.invoke(messages)
-            if hasattr(response, 'content'):
-                return response.content
-            return str(response)
-        except Exception as e:
-            return f"I apologize, but I encountered an error generating a response: {str(e)}"
@@ -1,12 +1,224 @@
 """
 Table parser service for extracting and classifying tables from PDF documents
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from decimal import Decimal
 from datetime import date, datetime
 from dateutil import parser as date_parser
+from functools import lru_cache
 import re
 
+# Common table date formats tried before the (much slower) dateutil fallback,
+# split by whether the cell starts with a digit or a month name.
+# Numeric formats list month-first before day-first to match dateutil's default.
+_DIGIT_FIRST_DATE_FORMATS = (
+    "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%m-%d-%Y",
+    "%d-%b-%Y", "%d %b %Y", "%d %B %Y",
+)
+_MONTH_FIRST_DATE_FORMATS = ("%b %d, %Y", "%B %d, %Y", "%b %d %Y", "%B %d %Y")
+
+# Bounds and patterns for the cheap "could this be a date" pre-check
+_MIN_DATE_LENGTH = 6
+_MAX_DATE_LENGTH = 32
+_DIGIT_RE = re.compile(r'\d')
+
+# Patterns used by _parse_amount, compiled once at import time
+_LETTER_RE = re.compile(r'[a-zA-Z]')
+_NON_NUMERIC_RE = re.compile(r'[^\d.]')
+_CURRENCY_SYMBOLS = '$€£¥'
+_CURRENCY_CHARS = frozenset(_CURRENCY_SYMBOLS)
+
+# Keywords used by _classify_table, checked against the header row first
+# and then against a sample of data rows (matched case-insensitively)
+_CAPITAL_CALL_KEYWORDS = ("capital call", "contribution", "call date", "called", "call number")
+_DISTRIBUTION_KEYWORDS = ("distribution", "distributed", "dividend", "recallable")
+_ADJUSTMENT_KEYWORDS = ("adjustment", "rebalance", "clawback", "refund")
+_ADJUSTMENT_DATA_KEYWORDS = _ADJUSTMENT_KEYWORDS + ("recallable distribution",)
+_CAPITAL_CALL_DATA_KEYWORDS = ("call 1", "call 2", "call 3", "call 4", "initial capital", "follow-on")
+
+
+def _category_pattern(categories: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> "re.Pattern[str]":
+    """
+    Compile (category, keywords) pairs into one case-insensitive pattern
+
+    Each category becomes a named group. The alternation sits in a lookahead
+    so matches may overlap, and at any position the earliest listed category
+    wins, so categories must be listed in priority order.
+    """
+    groups = "|".join(
+        f"(?P<{category}>" + "|".join(re.escape(keyword) for keyword in keywords) + ")"
+        for category, keywords in categories
+    )
+    return re.compile(f"(?=(?:{groups}))", re.IGNORECASE)
+
+
+def _first_category(pattern: "re.Pattern[str]", text: str, priority: Tuple[str, ...]) -> Optional[str]:
+    """Return the highest-priority category with a keyword anywhere in text"""
+    found = set()
+    for match in pattern.finditer(text):
+        if match.lastgroup == priority[0]:
+            return match.lastgroup
+        found.add(match.lastgroup)
+    return next((category for category in priority if category in found), None)
+
+
+# Header keywords in priority order, then keywords checked in sample data rows
+_HEADER_PRIORITY = ("capital_call", "distribution", "adjustment")
+_HEADER_RE = _category_pattern((
+    ("capital_call", _CAPITAL_CALL_KEYWORDS),
+    ("distribution", _DISTRIBUTION_KEYWORDS),
+    ("adjustment", _ADJUSTMENT_KEYWORDS),
+))
+_DATA_PRIORITY = ("adjustment", "capital_call")
+_DATA_RE = _category_pattern((
+    ("adjustment", _ADJUSTMENT_DATA_KEYWORDS),
+    ("capital_call", _CAPITAL_CALL_DATA_KEYWORDS),
+))
+
+
+@lru_cache(maxsize=8192)
+def _parse_exact_date_cached(date_str: str) -> Optional[date]:
+    """
+    Parse a stripped cell with the ISO and fixed-format fast paths
+
+    These formats always give complete dates, so results are shared
+    process-wide. Returns None when no fixed format matches.
+    """
+    if date_str[0].isdigit():
+        try:
+            return datetime.fromisoformat(date_str.replace('Z', '+00:00')).date()
+        except ValueError:
+            pass
+        formats = _DIGIT_FIRST_DATE_FORMATS
+    else:
+        formats = _MONTH_FIRST_DATE_FORMATS
+
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_date_fallback(date_str: str) -> Optional[date]:
+    """
+    Parse a stripped cell with dateutil
+
+    dateutil fills a missing year, month or day from today's date, so
+    these results are not cached process-wide; _CellValueCache still
+    memoizes them for one table.
+    """
+    try:
+        # Try dateutil parser (handles many formats). Fuzzy matching only
+        # helps with words around a date ("As of ..."), so cells without
+        # letters are parsed strictly and stray symbols are not skipped
+        fuzzy = _LETTER_RE.search(date_str) is not None
+        parsed = date_parser.parse(date_str, fuzzy=fuzzy)
+        return parsed.date()
+    except:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_amount_cached(amount_str: str) -> Optional[Decimal]:
+    """
+    Parse a non-empty amount string; see TableParser._parse_amount
+
+    Real tables repeat the same amounts across rows and documents, and the
+    result is an immutable Decimal, so parses are shared process-wide.
+    """
+    try:
+        # Remove whitespace
+        original = amount_str.strip()
+
+        # Reject if it contains letters (e.g., "Call 1", "Call Number")
+        # But allow currency symbols ($, €, £, etc.)
+        if _LETTER_RE.search(original):
+            return None
+
+        # Check if it looks like a monetary amount:
+        # - Has currency symbol ($, €, £)
+        # - Has comma separator (1,000,000)
+        # - Has decimal point with 2 digits (.00)
+        # - Or is a large number (4+ digits)
+        has_currency = not _CURRENCY_CHARS.isdisjoint(original)
+        has_separator = ',' in original
+        has_decimal = original[-3:-2] == '.' and original[-2:].isdecimal()
+
+        cleaned = original
+
+        # Check if amount is negative (parentheses notation)
+        is_negative = cleaned.startswith('(') and cleaned.endswith(')')
+        if is_negative:
+            cleaned = cleaned[1:-1]
+
+        # Check for explicit negative sign
+        if cleaned.startswith('-'):
+            is_negative = True
+            cleaned = cleaned[1:]
+
+        # Remove all non-digit and non-decimal point characters. Plain
+        # amounts like '$1,500,000.00' only need separators and a leading
+        # currency symbol dropped, which is much cheaper than the regex.
+        stripped = cleaned.replace(',', '').lstrip(_CURRENCY_SYMBOLS)
+        if stripped.replace('.', '').isdecimal():
+            cleaned = stripped
+        else:
+            cleaned = _NON_NUMERIC_RE.sub('', cleaned)
+
+        if not cleaned:
+            return None
+
+        # Convert to Decimal
+        amount = Decimal(cleaned)
+
+        # Reject very small amounts unless they have indicators of being monetary
+        # This prevents "Call 1" → 1, "Call 2" → 2, etc.
+        if amount < 100 and not (has_currency or has_separator or has_decimal):
+            return None
+
+        # Apply negative sign if needed
+        if is_negative:
+            amount = -amount
+
+        return amount
+    except:
+        return None
+
+
+def _cell_strings(row: List[Any]) -> List[str]:
+    """Convert a row's cells to stripped strings once; empty cells become ''"""
+    return [str(cell).strip() if cell else "" for cell in row]
+
+
+class _CellValueCache:
+    """
+    Memoizes date and amount parses for one table
+
+    Tables repeat the same cells (type labels, round amounts) on many rows;
+    each distinct string is parsed at most once per table.
+    """
+
+    def __init__(self, parser: "TableParser"):
+        self._parser = parser
+        self._dates: Dict[str, Optional[date]] = {}
+        self._amounts: Dict[str, Optional[Decimal]] = {}
+
+    def date(self, value: str) -> Optional[date]:
+        try:
+            return self._dates[value]
+        except KeyError:
+            parsed = self._dates[value] = self._parser._parse_date(value)
+            return parsed
+
+    def amount(self, value: str) -> Optional[Decimal]:
+        try:
+            return self._amounts[value]
+        except KeyError:
+            parsed = self._amounts[value] = self._parser._parse_amount(value)
+            return parsed
+
 
 class TableParser:
     """Parse tables from PDF documents and classify them"""
@@ -52,43 +264,34 @@ class TableParser:
         if not table or not table[0]:
             return "unknown"
 
-        # Join all cells in the first row (header) and convert to lowercase
-        header = " ".join([str(cell).lower() if cell else "" for cell in table[0]])
-
-        # Capital call keywords
-        if any(keyword in header for keyword in ["capital call", "contribution", "call date", "called", "call number"]):
-            return "capital_call"
+        # Join all cells in the first row (header); matching ignores case
+        header = " ".join([str(cell) if cell else "" for cell in table[0]])
 
-        # Distribution keywords
-        if any(keyword in header for keyword in ["distribution", "distributed", "dividend", "recallable"]):
-            return "distribution"
-
-        # Adjustment keywords
-        if any(keyword in header for keyword in ["adjustment", "rebalance", "clawback", "refund"]):
-            return "adjustment"
+        # Capital call, then distribution, then adjustment keywords
+        table_type = _first_category(_HEADER_RE, header, _HEADER_PRIORITY)
+        if table_type:
+            return table_type
 
         # If header doesn't match, check first few data rows for keywords
         # This helps with generic headers like "Date, Type, Amount, Description"
         if len(table) > 1:
             # Check first 3 data rows (skip header)
             sample_rows = " ".join([
-                " ".join([str(cell).lower() if cell else "" for cell in row])
+                " ".join([str(cell) if cell else "" for cell in row])
                 for row in table[1:min(4, len(table))]
             ])
 
-            # Check for adjustment keywords in data
-            if any(keyword in sample_rows for keyword in ["adjustment", "rebalance", "clawback", "refund", "recallable distribution"]):
-                return "adjustment"
-
-            # Check for capital call keywords in data
-            if any(keyword in sample_rows for keyword in ["call 1", "call 2", "call 3", "call 4", "initial capital", "follow-on"]):
-                return "capital_call"
+            # Adjustment keywords take precedence over capital call keywords
+            table_type = _first_category(_DATA_RE, sample_rows, _DATA_PRIORITY)
+            if table_type:
+                return table_type
 
         return "unknown"
 
     def _parse_capital_calls(self, table: List[List[str]], fund_id: int) -> List[Dict[str, Any]]:
         """Parse capital call table"""
         calls = []
+        cell_values = _CellValueCache(self)
 
         # Skip header row
         for row in table[1:]:
@@ -103,27 +306,26 @@ class TableParser:
                 description = None
 
                 # Iterate through cells to find date and amount
-                for i, cell in enumerate(row):
-                    if not cell:
+                for cell_str in _cell_strings(row):
+                    if not cell_str:
                         continue
 
                     # Try to parse as date
                     if call_date is None:
-                        parsed_date = self._parse_date(str(cell))
+                        parsed_date = cell_values.date(cell_str)
                         if parsed_date:
                             call_date = parsed_date
                             continue
 
                     # Try to parse as amount
                     if amount is None:
-                        parsed_amount = self._parse_amount(str(cell))
+                        parsed_amount = cell_values.amount(cell_str)
                         if parsed_amount and parsed_amount > 0:
                             amount = parsed_amount
                             continue
 
                     # Everything else might be description or type
-                    cell_str = str(cell).strip()
-                    if cell_str and cell_str.lower() not in ['date', 'amount', 'description']:
+                    if cell_str.lower() not in ['date', 'amount', 'description']:
                         if call_type is None and len(cell_str) < 50:
                             call_type = cell_str
                         elif description is None:
@@ -148,6 +350,7 @@ class TableParser:
     def _parse_distributions(self, table: List[List[str]], fund_id: int) -> List[Dict[str, Any]]:
         """Parse distribution table"""
         distributions = []
+        cell_values = _CellValueCache(self)
 
         # Skip header row
         for row in table[1:]:
@@ -162,33 +365,33 @@ class TableParser:
                 description = None
 
                 # Iterate through cells
-                for i, cell in enumerate(row):
-                    if not cell:
+                for cell_str in _cell_strings(row):
+                    if not cell_str:
                         continue
 
-                    cell_str = str(cell).strip()
-
                     # Try to parse as date
                     if distribution_date is None:
-                        parsed_date = self._parse_date(cell_str)
+                        parsed_date = cell_values.date(cell_str)
                         if parsed_date:
                             distribution_date = parsed_date
                             continue
 
                     # Try to parse as amount
                     if amount is None:
-                        parsed_amount = self._parse_amount(cell_str)
+                        parsed_amount = cell_values.amount(cell_str)
                         if parsed_amount and parsed_amount > 0:
                             amount = parsed_amount
                             continue
 
+                    cell_lower = cell_str.lower()
+
                     # Check for recallable flag
-                    if cell_str.lower() in ['yes', 'true', 'recallable']:
+                    if cell_lower in ['yes', 'true', 'recallable']:
                         is_recallable = True
                         continue
 
                     # Type or description
-                    if cell_str and cell_str.lower() not in ['date', 'amount', 'description', 'no', 'false']:
+                    if cell_lower not in ['date', 'amount', 'description', 'no', 'false']:
                         if distribution_type is None and len(cell_str) < 50:
                             distribution_type = cell_str
                         elif description is None:
@@ -214,6 +417,7 @@ class TableParser:
     def _parse_adjustments(self, table: List[List[str]], fund_id: int) -> List[Dict[str, Any]]:
         """Parse adjustment table"""
         adjustments = []
+        cell_values = _CellValueCache(self)
 
         # Skip header row
         for row in table[1:]:
@@ -229,32 +433,32 @@ class TableParser:
                 description = None
 
                 # Iterate through cells
-                for i, cell in enumerate(row):
-                    if not cell:
+                for cell_str in _cell_strings(row):
+                    if not cell_str:
                         continue
 
-                    cell_str = str(cell).strip()
-
                     # Try to parse as date
                     if adjustment_date is None:
-                        parsed_date = self._parse_date(cell_str)
+                        parsed_date = cell_values.date(cell_str)
                         if parsed_date:
                             adjustment_date = parsed_date
                             continue
 
                     # Try to parse as amount (can be negative)
                     if amount is None:
-                        parsed_amount = self._parse_amount(cell_str)
+                        parsed_amount = cell_values.amount(cell_str)
                         if parsed_amount != 0:
                             amount = parsed_amount
                             continue
 
+                    cell_lower = cell_str.lower()
+
                     # Check for contribution adjustment flag
-                    if 'contribution' in cell_str.lower() or 'capital call' in cell_str.lower():
+                    if 'contribution' in cell_lower or 'capital call' in cell_lower:
                         is_contribution_adjustment = True
 
                     # Type, category, or description
-                    if cell_str and cell_str.lower() not in ['date', 'amount', 'description', 'type', 'category']:
+                    if cell_lower not in ['date', 'amount', 'description', 'type', 'category']:
                         if adjustment_type is None and len(cell_str) < 50:
                             adjustment_type = cell_str
                         elif category is None and len(cell_str) < 50:
@@ -280,6 +484,19 @@ class TableParser:
 
         return adjustments
 
+    @staticmethod
+    def _looks_like_date(value: str) -> bool:
+        """
+        Cheap pre-check that rejects cells which cannot hold a date
+
+        Fuzzy dateutil parsing is slow on non-date text and happily turns
+        amounts and labels into dates, so currency values, cells without
+        digits and very short or long strings are skipped.
+        """
+        if not _MIN_DATE_LENGTH <= len(value) <= _MAX_DATE_LENGTH:
+            return False
+        return _CURRENCY_CHARS.isdisjoint(value) and _DIGIT_RE.search(value) is not None
+
     def _parse_date(self, date_str: str) -> Optional[date]:
         """
         Parse various date formats
@@ -293,16 +510,17 @@ class TableParser:
         if not date_str or not isinstance(date_str, str):
             return None
 
-        try:
-            # Remove common extra text
-            date_str = date_str.strip()
-
-            # Try dateutil parser (handles many formats)
-            parsed = date_parser.parse(date_str, fuzzy=True)
-            return parsed.date()
-        except:
+        # Remove common extra text
+        date_str = date_str.strip()
+        if not self._looks_like_date(date_str):
             return None
 
+        # Fast path: ISO dates and a few common formats
+        parsed = _parse_exact_date_cached(date_str)
+        if parsed is not None:
+            return parsed
+        return _parse_date_fallback(date_str)
+
     def _parse_amount(self, amount_str: str) -> Optional[Decimal]:
         """
         Parse amount strings like '$1,000,000.00', '(500,000)', etc.
@@ -316,54 +534,4 @@ class TableParser:
         if not amount_str or not isinstance(amount_str, str):
             return None
 
-        try:
-            # Remove whitespace
-            original = amount_str.strip()
-
-            # Reject if it contains letters (e.g., "Call 1", "Call Number")
-            # But allow currency symbols ($, €, £, etc.)
-            if re.search(r'[a-zA-Z]', original):
-                return None
-
-            # Check if it looks like a monetary amount:
-            # - Has currency symbol ($, €, £)
-            # - Has comma separator (1,000,000)
-            # - Has decimal point with 2 digits (.00)
-            # - Or is a large number (4+ digits)
-            has_currency = bool(re.search(r'[$€£¥]', original))
-            has_separator = ',' in original
-            has_decimal = bool(re.match(r'.*\.\d{2}$', original))
-
-            cleaned = original
-
-            # Check if amount is negative (parentheses notation)
-            is_negative = cleaned.startswith('(') and cleaned.endswith(')')
-            if is_negative:
-                cleaned = cleaned[1:-1]
-
-            # Check for explicit negative sign
-            if cleaned.startswith('-'):
-                is_negative = True
-                cleaned = cleaned[1:]
-
-            # Remove all non-digit and non-decimal point characters
-            cleaned = re.sub(r'[^\d.]', '', cleaned)
-
-            if not cleaned:
-                return None
-
-            # Convert to Decimal
-            amount = Decimal(cleaned)
-
-            # Reject very small amounts unless they have indicators of being monetary
-            # This prevents "Call 1" → 1, "Call 2" → 2, etc.
-            if amount < 100 and not (has_currency or has_separator or has_decimal):
-                return None
-
-            # Apply negative sign if needed
-            if is_negative:
-                amount = -amount
-
-            return amount
-        except:
-            return None
+        return _parse_amount_cached(amount_str)
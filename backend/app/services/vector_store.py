@@ -7,19 +7,295 @@ TODO: Implement vector storage using pgvector
 - Implement similarity search using pgvector operators
 - Handle metadata filtering
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+import asyncio
+import csv
+import io
+import json
 import numpy as np
 import os
+import threading
+import time
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from app.core.config import settings
 from app.db.session import SessionLocal
 
 
+class _SearchCache:
+    """
+    Bounded LRU cache of similarity search results with a TTL
+
+    Shared by all VectorStore instances in the process. Entries expire
+    after SEARCH_CACHE_TTL seconds so documents ingested by other
+    processes eventually surface; local writes clear the cache.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+
+    @staticmethod
+    def key(query: str, k: int, filter_metadata: Optional[Dict[str, Any]]) -> Tuple:
+        filters = tuple(sorted((filter_metadata or {}).items()))
+        return (query.strip(), k, filters)
+
+    def get(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, results = entry
+        if time.monotonic() - stored_at > settings.SEARCH_CACHE_TTL:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return list(results)
+
+    def put(self, key: Tuple, results: List[Dict[str, Any]]):
+        self._entries[key] = (time.monotonic(), list(results))
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.SEARCH_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+_search_cache = _SearchCache()
+
+
+class _FundVectorCache:
+    """
+    Per-fund embedding matrices for searching small funds with numpy
+
+    Each entry holds the fund's row ids and their L2-normalized embeddings,
+    or None when the fund has more than FUND_VECTOR_CACHE_MAX_ROWS rows and
+    should be searched in PostgreSQL instead. Row content is not cached;
+    it is fetched for the top-k ids only. Entries expire after
+    SEARCH_CACHE_TTL, and least recently used funds are evicted once the
+    cached arrays exceed FUND_VECTOR_CACHE_MAX_BYTES. Lookups run in worker
+    threads via asyncio.to_thread, so every access holds a lock.
+    """
+
+    _MISSING = object()
+
+    def __init__(self):
+        self._entries: "OrderedDict[int, Tuple[float, Optional[Tuple[np.ndarray, np.ndarray]]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(vectors: Optional[Tuple[np.ndarray, np.ndarray]]) -> int:
+        return 0 if vectors is None else sum(array.nbytes for array in vectors)
+
+    def _remove(self, fund_id: int):
+        _, vectors = self._entries.pop(fund_id)
+        self._bytes -= self._size(vectors)
+
+    def get(self, fund_id: int):
+        """Return the cached (ids, matrix) entry (possibly None), or _MISSING if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(fund_id)
+            if entry is None:
+                return self._MISSING
+
+            stored_at, vectors = entry
+            if time.monotonic() - stored_at > settings.SEARCH_CACHE_TTL:
+                self._remove(fund_id)
+                return self._MISSING
+
+            self._entries.move_to_end(fund_id)
+            return vectors
+
+    def put(self, fund_id: int, vectors: Optional[Tuple[np.ndarray, np.ndarray]]):
+        with self._lock:
+            if fund_id in self._entries:
+                self._remove(fund_id)
+            self._entries[fund_id] = (time.monotonic(), vectors)
+            self._bytes += self._size(vectors)
+            # Evicts the new entry too if it alone is over the budget
+            while self._bytes > settings.FUND_VECTOR_CACHE_MAX_BYTES:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, fund_id: int):
+        """Drop one fund's entry after its embeddings changed"""
+        with self._lock:
+            if fund_id in self._entries:
+                self._remove(fund_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_fund_vectors = _FundVectorCache()
+
+_HUGGINGFACE_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Built once so every insert reuses the same statement and its compiled form
+_INSERT_EMBEDDING_SQL = text("""
+    INSERT INTO document_embeddings (document_id, fund_id, content, embedding, metadata)
+    VALUES (:document_id, :fund_id, :content, CAST(:embedding AS halfvec), CAST(:metadata AS jsonb))
+""")
+_COPY_EMBEDDINGS_SQL = (
+    "COPY document_embeddings (document_id, fund_id, content, embedding, metadata) "
+    "FROM STDIN WITH (FORMAT csv, FORCE_NULL (document_id, fund_id))"
+)
+
+
+def _to_vector_literal(embedding: np.ndarray) -> str:
+    """
+    Format an embedding as a pgvector text literal
+
+    numpy prints the shortest float32 repr, which round-trips exactly to the
+    float32 value at about half the size of str(list).
+    """
+    return "[" + ",".join(embedding.astype(str)) + "]"
+
+
+@lru_cache(maxsize=None)
+def _get_embeddings_backend(
+    backend: str,
+    model: str,
+    api_key: Optional[str] = None
+):
+    """
+    Build the embeddings client; cached so each model is loaded once per process
+
+    Loading the local HuggingFace model takes seconds, so it must not be
+    repeated for every VectorStore created by a request handler. The
+    LangChain backends (and torch/onnxruntime behind them) are imported
+    here rather than at module load, and only for the backend in use.
+    """
+    if backend == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
+        print("Initializing OpenAI embeddings...")
+        return OpenAIEmbeddings(
+            model=model,
+            openai_api_key=api_key
+        )
+
+    # Opt-in: FastEmbed's ONNX Runtime build of the model encodes several
+    # times faster on CPU, but it is a quantized export, so its vectors differ
+    # slightly from stored sentence-transformers ones. Re-embed before switching.
+    if settings.LOCAL_EMBEDDING_RUNTIME == "onnx":
+        try:
+            import fastembed  # noqa: F401 - ONNX Runtime backend for FastEmbedEmbeddings
+            from langchain_community.embeddings import FastEmbedEmbeddings
+        except ImportError:
+            print("Warning: fastembed not installed, falling back to sentence-transformers")
+        else:
+            print(f"Initializing FastEmbed ONNX embeddings (model: {model})...")
+            return FastEmbedEmbeddings(
+                model_name=model
+            )
+
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    print(f"Initializing HuggingFace embeddings (model: {model})...")
+    return HuggingFaceEmbeddings(
+        model_name=model
+    )
+
+
+def embedding_dimension() -> int:
+    """
+    Embedding dimension for the configured provider
+
+    - 1536 for OpenAI embeddings
+    - 384 for HuggingFace sentence-transformers
+    """
+    llm_provider = os.getenv("LLM_PROVIDER", "openai").lower()
+    return 1536 if llm_provider == "openai" and settings.OPENAI_API_KEY != "sk-your-api-key-here" else 384
+
+
+def embedding_column_type(db: Session) -> Optional[str]:
+    """Declared type of document_embeddings.embedding, e.g. 'halfvec(384)', or None"""
+    return db.execute(text("""
+        SELECT format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = to_regclass('document_embeddings') AND attname = 'embedding'
+    """)).scalar()
+
+
+def ensure_vector_schema(db: Session) -> bool:
+    """
+    Ensure pgvector extension is enabled
+
+    Creates document_embeddings table with the provider's vector dimension
+    (see embedding_dimension).
+
+    Embeddings are stored as halfvec (float16), halving table and index
+    size; the recall loss for cosine search is negligible. halfvec needs
+    pgvector 0.7 or later.
+
+    Idempotent; run at application startup. Tables created before halfvec
+    are not rewritten here: converting them takes an ACCESS EXCLUSIVE lock
+    for the whole table rewrite, so that is left to the explicit
+    app.db.migrate_halfvec migration. Returns True on success.
+    """
+    try:
+        # Enable pgvector extension
+        db.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+
+        create_table_sql = f"""
+        CREATE TABLE IF NOT EXISTS document_embeddings (
+            id SERIAL PRIMARY KEY,
+            document_id INTEGER,
+            fund_id INTEGER,
+            content TEXT NOT NULL,
+            embedding halfvec({embedding_dimension()}),
+            metadata JSONB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- Lets the planner answer fund/document filtered searches from the
+        -- matching rows with an exact distance sort instead of post-filtering
+        -- the HNSW candidates, which loses recall for selective filters
+        CREATE INDEX IF NOT EXISTS document_embeddings_fund_id_idx
+        ON document_embeddings (fund_id);
+
+        CREATE INDEX IF NOT EXISTS document_embeddings_document_id_idx
+        ON document_embeddings (document_id);
+        """
+        db.execute(text(create_table_sql))
+
+        column_type = embedding_column_type(db)
+        if not column_type.startswith("halfvec"):
+            db.commit()
+            print(
+                f"document_embeddings.embedding is {column_type}, not halfvec; "
+                "run `python -m app.db.migrate_halfvec` to convert it"
+            )
+            return False
+
+        create_index_sql = f"""
+        DROP INDEX IF EXISTS document_embeddings_embedding_idx;
+
+        CREATE INDEX IF NOT EXISTS document_embeddings_embedding_hnsw_idx
+        ON document_embeddings USING hnsw (embedding halfvec_cosine_ops)
+        WITH (m = {int(settings.HNSW_M)}, ef_construction = {int(settings.HNSW_EF_CONSTRUCTION)});
+        """
+
+        db.execute(text(create_index_sql))
+        db.commit()
+        return True
+    except Exception as e:
+        print(f"Error ensuring pgvector extension: {e}")
+        db.rollback()
+        return False
+
+
 class VectorStore:
     """pgvector-based vector store for document embeddings"""
+
+    # Set once ensure_vector_schema has succeeded in this process
+    _extension_ensured = False
     
     def __init__(self, db: Session = None):
         self.db = db or SessionLocal()
@@ -38,55 +314,16 @@ class VectorStore:
 
         # Use OpenAI embeddings only when explicitly using OpenAI provider
         if llm_provider == "openai" and settings.OPENAI_API_KEY and settings.OPENAI_API_KEY != "sk-your-api-key-here":
-            print("Initializing OpenAI embeddings...")
-            return OpenAIEmbeddings(
-                model=settings.OPENAI_EMBEDDING_MODEL,
-                openai_api_key=settings.OPENAI_API_KEY
-            )
-        else:
-            # Use local HuggingFace embeddings for Gemini, Ollama, or when no valid OpenAI key
-            print(f"Initializing HuggingFace embeddings (LLM provider: {llm_provider})...")
-            return HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2"
-            )
+            return _get_embeddings_backend("openai", settings.OPENAI_EMBEDDING_MODEL, settings.OPENAI_API_KEY)
+
+        # Use local HuggingFace embeddings for Gemini, Ollama, or when no valid OpenAI key
+        return _get_embeddings_backend("huggingface", _HUGGINGFACE_EMBEDDING_MODEL)
     
     def _ensure_extension(self):
-        """
-        Ensure pgvector extension is enabled
-
-        Creates document_embeddings table with appropriate vector dimensions:
-        - 1536 for OpenAI embeddings
-        - 384 for HuggingFace sentence-transformers
-        """
-        try:
-            # Enable pgvector extension
-            self.db.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-
-            # Determine embedding dimension based on LLM provider
-            llm_provider = os.getenv("LLM_PROVIDER", "openai").lower()
-            dimension = 1536 if llm_provider == "openai" and settings.OPENAI_API_KEY != "sk-your-api-key-here" else 384
-            
-            create_table_sql = f"""
-            CREATE TABLE IF NOT EXISTS document_embeddings (
-                id SERIAL PRIMARY KEY,
-                document_id INTEGER,
-                fund_id INTEGER,
-                content TEXT NOT NULL,
-                embedding vector({dimension}),
-                metadata JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            
-            CREATE INDEX IF NOT EXISTS document_embeddings_embedding_idx 
-            ON document_embeddings USING ivfflat (embedding vector_cosine_ops)
-            WITH (lists = 100);
-            """
-            
-            self.db.execute(text(create_table_sql))
-            self.db.commit()
-        except Exception as e:
-            print(f"Error ensuring pgvector extension: {e}")
-            self.db.rollback()
+        """Create the pgvector schema once per process (normally done at startup)"""
+        if VectorStore._extension_ensured:
+            return
+        VectorStore._extension_ensured = ensure_vector_schema(self.db)
     
     async def add_document(self, content: str, metadata: Dict[str, Any]):
         """
@@ -96,34 +333,82 @@ class VectorStore:
         - Insert into document_embeddings table
         - Store metadata as JSONB
         """
+        await self.add_documents(texts=[content], metadatas=[metadata])
+
+    async def add_documents(self, texts: List[str], metadatas: List[Dict[str, Any]]):
+        """
+        Add a batch of documents to the vector store
+
+        - Generate embeddings in batches, with batches embedded concurrently
+        - Insert rows with executemany, or COPY for large batches on PostgreSQL
+        - Store metadata as JSONB
+        """
+        if not texts:
+            return
+
         try:
-            # Generate embedding (sync call, not async)
-            embedding = self._get_embedding(content)
-            embedding_list = embedding.tolist()
-
-            # Convert metadata to JSON string
-            import json
-            metadata_json = json.dumps(metadata)
-
-            # Insert into database
-            insert_sql = text("""
-                INSERT INTO document_embeddings (document_id, fund_id, content, embedding, metadata)
-                VALUES (:document_id, :fund_id, :content, CAST(:embedding AS vector), CAST(:metadata AS jsonb))
-            """)
+            # Generate embeddings
+            embeddings = await self._embed_batches(texts)
 
-            self.db.execute(insert_sql, {
-                "document_id": metadata.get("document_id"),
-                "fund_id": metadata.get("fund_id"),
-                "content": content,
-                "embedding": str(embedding_list),
-                "metadata": metadata_json
-            })
-            self.db.commit()
+            # Insert into database with a single commit
+            rows = [
+                {
+                    "document_id": metadata.get("document_id"),
+                    "fund_id": metadata.get("fund_id"),
+                    "content": content,
+                    "embedding": _to_vector_literal(embedding),
+                    "metadata": json.dumps(metadata)
+                }
+                for content, metadata, embedding in zip(texts, metadatas, embeddings)
+            ]
+            # Database calls block, so they run in a worker thread
+            await asyncio.to_thread(self._insert_rows, rows)
+            _search_cache.clear()
+            for fund_id in {row["fund_id"] for row in rows}:
+                _fund_vectors.invalidate(fund_id)
         except Exception as e:
-            print(f"Error adding document: {e}")
+            print(f"Error adding documents: {e}")
             self.db.rollback()
             raise
     
+    def _insert_rows(self, rows: List[Dict[str, Any]]):
+        """Insert embedding rows and commit (synchronous)"""
+        if len(rows) >= settings.EMBEDDING_COPY_MIN_ROWS and self._supports_copy():
+            self._copy_rows(rows)
+        else:
+            batch_size = settings.BULK_INSERT_BATCH_SIZE
+            for start in range(0, len(rows), batch_size):
+                self.db.execute(_INSERT_EMBEDDING_SQL, rows[start:start + batch_size])
+        self.db.commit()
+
+    def _supports_copy(self) -> bool:
+        """COPY needs a psycopg2 connection to PostgreSQL"""
+        bind = self.db.get_bind()
+        return bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2"
+
+    def _copy_rows(self, rows: List[Dict[str, Any]]):
+        """
+        Load embedding rows with COPY ... FROM STDIN in CSV format
+
+        Runs on the session's own connection, so the rows are committed or
+        rolled back together with the rest of the session.
+        """
+        buffer = io.StringIO()
+        # Strings are quoted so empty content stays distinct from NULL;
+        # FORCE_NULL turns the empty ids written for None back into NULL
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerows(
+            (row["document_id"], row["fund_id"], row["content"], row["embedding"], row["metadata"])
+            for row in rows
+        )
+        buffer.seek(0)
+
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(_COPY_EMBEDDINGS_SQL, buffer)
+        finally:
+            cursor.close()
+
     async def similarity_search(
         self,
         query: str,
@@ -146,15 +431,33 @@ class VectorStore:
         Returns:
             List of similar documents with scores
         """
+        # Repeated queries skip the embedding call and the database search.
+        # The key keeps the query's case, since embeddings can be case-sensitive,
+        # and the stripped text it holds is what gets embedded
+        query = query.strip()
+        cache_key = _SearchCache.key(query, k, filter_metadata)
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            # Generate query embedding (sync call, not async)
-            query_embedding = self._get_embedding(query)
-            embedding_list = query_embedding.tolist()
+            # Generate query embedding in a worker thread (the call is blocking)
+            query_embedding = await asyncio.to_thread(self._get_embedding, query)
+
+            # Small funds are searched in memory with one matrix-vector product
+            filter_keys = {key for key in (filter_metadata or {}) if key in ["document_id", "fund_id"]}
+            if filter_keys == {"fund_id"}:
+                results = await asyncio.to_thread(
+                    self._search_fund_vectors, filter_metadata["fund_id"], query_embedding, k
+                )
+                if results is not None:
+                    _search_cache.put(cache_key, results)
+                    return results
 
             # Build query with optional filters
             where_clause = ""
             params = {
-                "query_embedding": str(embedding_list),
+                "query_embedding": _to_vector_literal(query_embedding),
                 "k": k
             }
 
@@ -175,14 +478,14 @@ class VectorStore:
                     fund_id,
                     content,
                     metadata,
-                    1 - (embedding <=> CAST(:query_embedding AS vector)) as similarity_score
+                    1 - (embedding <=> CAST(:query_embedding AS halfvec)) as similarity_score
                 FROM document_embeddings
                 {where_clause}
-                ORDER BY embedding <=> CAST(:query_embedding AS vector)
+                ORDER BY embedding <=> CAST(:query_embedding AS halfvec)
                 LIMIT :k
             """)
 
-            result = self.db.execute(search_sql, params)
+            result = await asyncio.to_thread(self._execute_search, search_sql, params)
 
             # Format results
             results = []
@@ -196,6 +499,7 @@ class VectorStore:
                     "score": float(row[5]) if row[5] is not None else 0.0
                 })
 
+            _search_cache.put(cache_key, results)
             return results
         except Exception as e:
             print(f"Error in similarity search: {e}")
@@ -203,6 +507,92 @@ class VectorStore:
             traceback.print_exc()
             return []
     
+    def _search_fund_vectors(
+        self,
+        fund_id: int,
+        query_embedding: np.ndarray,
+        k: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Exact cosine search over a fund's cached embeddings (synchronous)
+
+        Returns None when the fund is too large to cache, in which case the
+        caller falls back to the pgvector search.
+        """
+        vectors = _fund_vectors.get(fund_id)
+        if vectors is _FundVectorCache._MISSING:
+            vectors = self._load_fund_vectors(fund_id)
+            _fund_vectors.put(fund_id, vectors)
+        if vectors is None:
+            return None
+
+        ids, matrix = vectors
+        if not len(ids) or k <= 0:
+            return []
+
+        norm = np.linalg.norm(query_embedding)
+        scores = matrix @ (query_embedding / norm if norm else query_embedding)
+
+        if k < len(ids):
+            top = np.argpartition(-scores, k)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            top = np.argsort(-scores, kind="stable")
+
+        # Content and metadata for the top-k rows only, in one query
+        top_ids = ids[top].tolist()
+        rows = {
+            row[0]: row
+            for row in self.db.execute(text("""
+                SELECT id, document_id, fund_id, content, metadata
+                FROM document_embeddings
+                WHERE id = ANY(:ids)
+            """), {"ids": top_ids})
+        }
+
+        # Rows deleted since the matrix was cached are skipped
+        return [
+            {
+                "id": row[0],
+                "document_id": row[1],
+                "fund_id": row[2],
+                "content": row[3],
+                "metadata": row[4],
+                "score": float(scores[i])
+            }
+            for i, row_id in zip(top, top_ids)
+            if (row := rows.get(row_id)) is not None
+        ]
+
+    def _load_fund_vectors(self, fund_id: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Load a fund's row ids and normalized float32 embedding matrix, or None if too large"""
+        count = self.db.execute(
+            text("SELECT count(*) FROM document_embeddings WHERE fund_id = :fund_id"),
+            {"fund_id": fund_id}
+        ).scalar()
+        if count > settings.FUND_VECTOR_CACHE_MAX_ROWS:
+            return None
+
+        rows = self.db.execute(text("""
+            SELECT id, embedding::text
+            FROM document_embeddings
+            WHERE fund_id = :fund_id AND embedding IS NOT NULL
+        """), {"fund_id": fund_id}).fetchall()
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32)
+
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        matrix = np.array([row[1][1:-1].split(",") for row in rows], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        return ids, matrix
+
+    def _execute_search(self, search_sql, params: Dict[str, Any]) -> List[Any]:
+        """Run the similarity query (synchronous, called from a worker thread)"""
+        # Scoped to the current transaction; SET does not take bind parameters
+        self.db.execute(text(f"SET LOCAL hnsw.ef_search = {int(settings.HNSW_EF_SEARCH)}"))
+        return self.db.execute(search_sql, params).fetchall()
+
     def _get_embedding(self, text: str) -> np.ndarray:
         """Generate embedding for text (synchronous)"""
         if hasattr(self.embeddings, 'embed_query'):
@@ -211,6 +601,38 @@ class VectorStore:
             embedding = self.embeddings.encode(text)
 
         return np.array(embedding, dtype=np.float32)
+
+    async def _embed_batches(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts in batches of EMBEDDING_BATCH_SIZE
+
+        Embedding calls are network- or model-bound, so batches run in worker
+        threads (keeping the event loop free) with at most
+        EMBEDDING_CONCURRENCY requests in flight at once.
+        """
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+        if len(batches) == 1:
+            return await asyncio.to_thread(self._get_embeddings, batches[0])
+
+        semaphore = asyncio.Semaphore(settings.EMBEDDING_CONCURRENCY)
+
+        async def embed(batch: List[str]) -> np.ndarray:
+            async with semaphore:
+                return await asyncio.to_thread(self._get_embeddings, batch)
+
+        results = await asyncio.gather(*(embed(batch) for batch in batches))
+        return np.concatenate(results)
+
+    def _get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for a batch of texts in one call (synchronous)"""
+        if hasattr(self.embeddings, 'embed_documents'):
+            embeddings = self.embeddings.embed_documents(texts)
+        else:
+            embeddings = self.embeddings.encode(texts)
+
+        return np.array(embeddings, dtype=np.float32)
     
     def clear(self, fund_id: Optional[int] = None):
         """
@@ -228,6 +650,11 @@ class VectorStore:
                 self.db.execute(delete_sql)
             
             self.db.commit()
+            _search_cache.clear()
+            if fund_id:
+                _fund_vectors.invalidate(fund_id)
+            else:
+                _fund_vectors.clear()
         except Exception as e:
             print(f"Error clearing vector store: {e}")
             self.db.rollback()
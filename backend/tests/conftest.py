@@ -3,57 +3,277 @@ Pytest configuration and fixtures
 
 Provides common test fixtures for database sessions, mock data, and test utilities
 """
+import os
 import pytest
-from sqlalchemy import create_engine
+from functools import lru_cache
+from sqlalchemy import create_engine, event, insert
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 from app.db.base import Base
 from app.models.fund import Fund
 from app.models.transaction import CapitalCall, Distribution, Adjustment
 from app.models.document import Document
+from dataclasses import asdict, dataclass
 from datetime import date
 from decimal import Decimal
+from typing import Optional
 
 
-@pytest.fixture(scope="function")
-def test_db():
+# Named in-memory database; every connection in the process sees the same data.
+# Each pytest-xdist worker is its own process and gets a private database.
+TEST_DATABASE_URL = (
+    "sqlite+pysqlite:///file:interopera_"
+    f"{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}?mode=memory&cache=shared&uri=true"
+)
+
+# Tests never need durability, so skip journal and fsync bookkeeping on commit
+TEST_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _apply_test_pragmas(dbapi_connection):
+    """Apply TEST_SQLITE_PRAGMAS to a raw SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    for pragma in TEST_SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+@lru_cache(maxsize=None)
+def get_test_engine():
     """
-    Create an in-memory SQLite database for testing
+    Create the in-memory SQLite engine used by all tests, once per process
 
-    Uses StaticPool to ensure the same database is used across threads
-    Automatically creates all tables and tears down after each test
+    Tests share the single connection from get_test_connection(), so the
+    engine needs no pool; NullPool skips checkout/checkin bookkeeping.
     """
-    # Create in-memory SQLite database
     engine = create_engine(
-        "sqlite:///:memory:",
+        TEST_DATABASE_URL,
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
+        poolclass=NullPool,
     )
 
+    # pysqlite defers BEGIN and breaks SAVEPOINT; let SQLAlchemy emit BEGIN itself
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        _apply_test_pragmas(dbapi_connection)
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_test_connection():
+    """
+    Open the connection all tests run on, once per process
+
+    It stays open for the whole run, which also keeps the in-memory
+    database alive. Tables are created on first use; tests are isolated by
+    rolling back their transaction instead of recreating the schema.
+    """
+    connection = get_test_engine().connect()
+
     # Create all tables
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=connection)
+    connection.commit()
+    return connection
 
-    # Create session
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = TestingSessionLocal()
+
+@pytest.fixture(scope="session")
+def test_engine():
+    """Engine shared by the whole test session"""
+    return get_test_engine()
+
+
+@pytest.fixture(scope="session")
+def test_connection():
+    """Connection shared by the whole test session"""
+    return get_test_connection()
+
+
+def _open_session(connection, **options):
+    """Session on connection whose commits become savepoints"""
+    TestingSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        **options,
+    )
+    return TestingSessionLocal()
+
+
+@pytest.fixture(scope="class")
+def class_connection(test_connection):
+    """
+    Test connection with a transaction spanning a whole test class
+
+    Class-scoped data is written in it once and rolled back when the class
+    finishes. While it is open, test_db nests each test in the class in a
+    savepoint.
+    """
+    transaction = test_connection.begin()
+
+    try:
+        yield test_connection
+    finally:
+        transaction.rollback()
+
+
+@pytest.fixture(scope="function")
+def test_db(test_connection):
+    """
+    Database session for one test, rolled back afterwards
+
+    The session joins an outer transaction and turns its own commits into
+    savepoints, so code under test can commit freely while everything it
+    wrote is discarded when the test ends. Inside a class using class-scoped
+    data the test runs in a savepoint within the class transaction, so only
+    its own writes are rolled back.
+    """
+    if test_connection.in_transaction():
+        transaction = test_connection.begin_nested()
+    else:
+        transaction = test_connection.begin()
+
+    session = _open_session(test_connection)
 
     try:
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+
+
+# Sample fund and transaction data shared by the fixtures below. Built once
+# at import: Decimal, date and the frozen rows are immutable, so every test
+# can safely share the same objects.
+SAMPLE_FUND = {
+    "name": "Test Venture Fund I",
+    "gp_name": "Test Capital Partners",
+    "fund_type": "Venture Capital",
+    "vintage_year": 2024
+}
+
+EMPTY_FUND = {
+    "name": "Empty Fund",
+    "gp_name": "Test GP",
+    "fund_type": "Venture Capital",
+    "vintage_year": 2024
+}
+
+
+@dataclass(frozen=True, slots=True)
+class CapitalCallRow:
+    """Capital call fixture data without a fund"""
+    call_date: date
+    amount: Decimal
+    call_type: str
+    description: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class DistributionRow:
+    """Distribution fixture data without a fund"""
+    distribution_date: date
+    amount: Decimal
+    distribution_type: str
+    is_recallable: bool
+    description: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class AdjustmentRow:
+    """Adjustment fixture data without a fund"""
+    adjustment_date: date
+    amount: Decimal
+    adjustment_type: str
+    category: str
+    is_contribution_adjustment: bool
+    description: Optional[str] = None
+
+
+SAMPLE_CAPITAL_CALLS = (
+    CapitalCallRow(
+        call_date=date(2024, 1, 15),
+        amount=Decimal("1000000"),
+        call_type="Investment",
+        description="Initial capital call for Series A investments",
+    ),
+    CapitalCallRow(
+        call_date=date(2024, 3, 20),
+        amount=Decimal("500000"),
+        call_type="Management Fee",
+        description="Q1 2024 management fee",
+    ),
+    CapitalCallRow(
+        call_date=date(2024, 6, 15),
+        amount=Decimal("750000"),
+        call_type="Investment",
+        description="Follow-on investments in portfolio companies",
+    ),
+)
+
+SAMPLE_DISTRIBUTIONS = (
+    DistributionRow(
+        distribution_date=date(2024, 4, 10),
+        amount=Decimal("250000"),
+        distribution_type="Dividend",
+        is_recallable=False,
+        description="Dividend from portfolio company A",
+    ),
+    DistributionRow(
+        distribution_date=date(2024, 7, 25),
+        amount=Decimal("600000"),
+        distribution_type="Return of Capital",
+        is_recallable=False,
+        description="Exit proceeds from company B",
+    ),
+    DistributionRow(
+        distribution_date=date(2024, 9, 30),
+        amount=Decimal("400000"),
+        distribution_type="Realized Gain",
+        is_recallable=True,
+        description="Q3 distributions - subject to recall",
+    ),
+)
+
+SAMPLE_ADJUSTMENTS = (
+    AdjustmentRow(
+        adjustment_date=date(2024, 5, 15),
+        amount=Decimal("50000"),
+        adjustment_type="Rebalance",
+        category="Distribution Clawback",
+        is_contribution_adjustment=False,
+        description="Clawback of recallable distribution",
+    ),
+    AdjustmentRow(
+        adjustment_date=date(2024, 8, 10),
+        amount=Decimal("-25000"),
+        adjustment_type="Refund",
+        category="Capital Call Adjustment",
+        is_contribution_adjustment=True,
+        description="Refund of overcalled capital",
+    ),
+)
 
 
 @pytest.fixture(scope="function")
 def sample_fund(test_db):
     """Create a sample fund for testing"""
-    fund = Fund(
-        name="Test Venture Fund I",
-        gp_name="Test Capital Partners",
-        vintage_year=2024,
-        fund_size=Decimal("100000000"),  # $100M fund
-        commitment_amount=Decimal("5000000")  # $5M commitment
-    )
+    fund = Fund(**SAMPLE_FUND)
     test_db.add(fund)
     test_db.commit()
     test_db.refresh(fund)
@@ -63,115 +283,25 @@ def sample_fund(test_db):
 @pytest.fixture(scope="function")
 def sample_capital_calls(test_db, sample_fund):
     """Create sample capital calls for testing"""
-    calls = [
-        CapitalCall(
-            fund_id=sample_fund.id,
-            call_date=date(2024, 1, 15),
-            amount=Decimal("1000000"),
-            call_type="Investment",
-            description="Initial capital call for Series A investments"
-        ),
-        CapitalCall(
-            fund_id=sample_fund.id,
-            call_date=date(2024, 3, 20),
-            amount=Decimal("500000"),
-            call_type="Management Fee",
-            description="Q1 2024 management fee"
-        ),
-        CapitalCall(
-            fund_id=sample_fund.id,
-            call_date=date(2024, 6, 15),
-            amount=Decimal("750000"),
-            call_type="Investment",
-            description="Follow-on investments in portfolio companies"
-        ),
-    ]
-
-    for call in calls:
-        test_db.add(call)
-
-    test_db.commit()
-
-    for call in calls:
-        test_db.refresh(call)
-
-    return calls
+    return _bulk_create(test_db, CapitalCall, [
+        {"fund_id": sample_fund.id, **asdict(row)} for row in SAMPLE_CAPITAL_CALLS
+    ])
 
 
 @pytest.fixture(scope="function")
 def sample_distributions(test_db, sample_fund):
     """Create sample distributions for testing"""
-    distributions = [
-        Distribution(
-            fund_id=sample_fund.id,
-            distribution_date=date(2024, 4, 10),
-            amount=Decimal("250000"),
-            distribution_type="Dividend",
-            is_recallable=False,
-            description="Dividend from portfolio company A"
-        ),
-        Distribution(
-            fund_id=sample_fund.id,
-            distribution_date=date(2024, 7, 25),
-            amount=Decimal("600000"),
-            distribution_type="Return of Capital",
-            is_recallable=False,
-            description="Exit proceeds from company B"
-        ),
-        Distribution(
-            fund_id=sample_fund.id,
-            distribution_date=date(2024, 9, 30),
-            amount=Decimal("400000"),
-            distribution_type="Realized Gain",
-            is_recallable=True,
-            description="Q3 distributions - subject to recall"
-        ),
-    ]
-
-    for dist in distributions:
-        test_db.add(dist)
-
-    test_db.commit()
-
-    for dist in distributions:
-        test_db.refresh(dist)
-
-    return distributions
+    return _bulk_create(test_db, Distribution, [
+        {"fund_id": sample_fund.id, **asdict(row)} for row in SAMPLE_DISTRIBUTIONS
+    ])
 
 
 @pytest.fixture(scope="function")
 def sample_adjustments(test_db, sample_fund):
     """Create sample adjustments for testing"""
-    adjustments = [
-        Adjustment(
-            fund_id=sample_fund.id,
-            adjustment_date=date(2024, 5, 15),
-            amount=Decimal("50000"),
-            adjustment_type="Rebalance",
-            category="Distribution Clawback",
-            is_contribution_adjustment=False,
-            description="Clawback of recallable distribution"
-        ),
-        Adjustment(
-            fund_id=sample_fund.id,
-            adjustment_date=date(2024, 8, 10),
-            amount=Decimal("-25000"),
-            adjustment_type="Refund",
-            category="Capital Call Adjustment",
-            is_contribution_adjustment=True,
-            description="Refund of overcalled capital"
-        ),
-    ]
-
-    for adj in adjustments:
-        test_db.add(adj)
-
-    test_db.commit()
-
-    for adj in adjustments:
-        test_db.refresh(adj)
-
-    return adjustments
+    return _bulk_create(test_db, Adjustment, [
+        {"fund_id": sample_fund.id, **asdict(row)} for row in SAMPLE_ADJUSTMENTS
+    ])
 
 
 @pytest.fixture(scope="function")
@@ -192,11 +322,14 @@ def sample_document(test_db, sample_fund):
     return document
 
 
-@pytest.fixture(scope="function")
-def complete_fund_data(test_db, sample_fund, sample_capital_calls,
-                        sample_distributions, sample_adjustments):
+@pytest.fixture(scope="class")
+def complete_fund_data(class_connection):
     """
-    Create a complete fund with all transaction types
+    Create a complete fund with all transaction types, once per test class
+
+    Everything is added with one add_all and written in a single commit.
+    Tests in the class share these rows; their own writes through test_db
+    are rolled back after each test.
 
     Returns a dict with:
     - fund: Fund object
@@ -204,24 +337,46 @@ def complete_fund_data(test_db, sample_fund, sample_capital_calls,
     - distributions: List of Distribution objects
     - adjustments: List of Adjustment objects
     """
+    # Objects stay loaded after the session closes, so tests read them
+    # without going back to the database
+    session = _open_session(class_connection, expire_on_commit=False)
+    fund = Fund(**SAMPLE_FUND)
+    capital_calls = [CapitalCall(fund=fund, **asdict(row)) for row in SAMPLE_CAPITAL_CALLS]
+    distributions = [Distribution(fund=fund, **asdict(row)) for row in SAMPLE_DISTRIBUTIONS]
+    adjustments = [Adjustment(fund=fund, **asdict(row)) for row in SAMPLE_ADJUSTMENTS]
+
+    session.add_all([fund, *capital_calls, *distributions, *adjustments])
+    session.commit()
+    session.close()
+
     return {
-        "fund": sample_fund,
-        "capital_calls": sample_capital_calls,
-        "distributions": sample_distributions,
-        "adjustments": sample_adjustments
+        "fund": fund,
+        "capital_calls": capital_calls,
+        "distributions": distributions,
+        "adjustments": adjustments
     }
 
 
+@pytest.fixture(scope="class")
+def class_fund(class_connection):
+    """
+    Create a fund without transactions, once per test class
+
+    For classes whose tests each add their own transactions: the fund row
+    is shared, and every test's writes through test_db are rolled back.
+    """
+    session = _open_session(class_connection, expire_on_commit=False)
+    fund = Fund(**SAMPLE_FUND)
+    session.add(fund)
+    session.commit()
+    session.close()
+    return fund
+
+
 @pytest.fixture(scope="function")
 def empty_fund(test_db):
     """Create a fund with no transactions"""
-    fund = Fund(
-        name="Empty Fund",
-        gp_name="Test GP",
-        vintage_year=2024,
-        fund_size=Decimal("50000000"),
-        commitment_amount=Decimal("2500000")
-    )
+    fund = Fund(**EMPTY_FUND)
     test_db.add(fund)
     test_db.commit()
     test_db.refresh(fund)
@@ -230,79 +385,89 @@ def empty_fund(test_db):
 
 # Helper functions for testing
 
+def _bulk_create(db, model, rows):
+    """Insert rows with one bulk INSERT ... RETURNING and commit; returns the ORM objects"""
+    objects = db.scalars(insert(model).returning(model), rows).all()
+    db.commit()
+    return objects
+
+
 def create_capital_call(db, fund_id, call_date, amount, call_type="Investment", description=None):
     """Helper to create a capital call"""
-    call = CapitalCall(
-        fund_id=fund_id,
-        call_date=call_date,
-        amount=amount,
-        call_type=call_type,
-        description=description
-    )
-    db.add(call)
-    db.commit()
-    db.refresh(call)
-    return call
+    return _bulk_create(db, CapitalCall, [{
+        "fund_id": fund_id,
+        "call_date": call_date,
+        "amount": amount,
+        "call_type": call_type,
+        "description": description
+    }])[0]
 
 
 def create_distribution(db, fund_id, distribution_date, amount,
                         distribution_type="Return of Capital",
                         is_recallable=False, description=None):
     """Helper to create a distribution"""
-    dist = Distribution(
-        fund_id=fund_id,
-        distribution_date=distribution_date,
-        amount=amount,
-        distribution_type=distribution_type,
-        is_recallable=is_recallable,
-        description=description
-    )
-    db.add(dist)
-    db.commit()
-    db.refresh(dist)
-    return dist
+    return _bulk_create(db, Distribution, [{
+        "fund_id": fund_id,
+        "distribution_date": distribution_date,
+        "amount": amount,
+        "distribution_type": distribution_type,
+        "is_recallable": is_recallable,
+        "description": description
+    }])[0]
+
+
+def create_capital_calls_bulk(db, fund_id, rows, call_type="Investment", description=None):
+    """Helper to create many capital calls from (call_date, amount) pairs in one INSERT"""
+    return _bulk_create(db, CapitalCall, [
+        {
+            "fund_id": fund_id,
+            "call_date": call_date,
+            "amount": amount,
+            "call_type": call_type,
+            "description": description
+        }
+        for call_date, amount in rows
+    ])
+
+
+def create_distributions_bulk(db, fund_id, rows,
+                              distribution_type="Return of Capital",
+                              is_recallable=False, description=None):
+    """Helper to create many distributions from (distribution_date, amount) pairs in one INSERT"""
+    return _bulk_create(db, Distribution, [
+        {
+            "fund_id": fund_id,
+            "distribution_date": distribution_date,
+            "amount": amount,
+            "distribution_type": distribution_type,
+            "is_recallable": is_recallable,
+            "description": description
+        }
+        for distribution_date, amount in rows
+    ])
 
 
 def create_adjustment(db, fund_id, adjustment_date, amount,
                       adjustment_type="Rebalance", category=None,
                       is_contribution_adjustment=False, description=None):
     """Helper to create an adjustment"""
-    adj = Adjustment(
-        fund_id=fund_id,
-        adjustment_date=adjustment_date,
-        amount=amount,
-        adjustment_type=adjustment_type,
-        category=category,
-        is_contribution_adjustment=is_contribution_adjustment,
-        description=description
-    )
-    db.add(adj)
-    db.commit()
-    db.refresh(adj)
-    return adj
-
-
-# Pytest configuration
-
-def pytest_configure(config):
-    """Configure pytest"""
-    config.addinivalue_line(
-        "markers", "slow: marks tests as slow (deselect with '-m \"not slow\"')"
-    )
-    config.addinivalue_line(
-        "markers", "integration: marks tests as integration tests"
-    )
-    config.addinivalue_line(
-        "markers", "unit: marks tests as unit tests"
-    )
-
-
-# Async test support
-
-@pytest.fixture
-def event_loop():
-    """Create an instance of the default event loop for each test case."""
-    import asyncio
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+    return _bulk_create(db, Adjustment, [{
+        "fund_id": fund_id,
+        "adjustment_date": adjustment_date,
+        "amount": amount,
+        "adjustment_type": adjustment_type,
+        "category": category,
+        "is_contribution_adjustment": is_contribution_adjustment,
+        "description": description
+    }])[0]
+
+
+# Pytest hooks
+
+def pytest_sessionfinish(session, exitstatus):
+    """Close the shared test connection and engine once, if they were opened"""
+    if get_test_connection.cache_info().currsize:
+        get_test_connection().close()
+    if get_test_engine.cache_info().currsize:
+        get_test_engine().dispose()
@@ -9,24 +9,89 @@ Tests document processing pipeline:
 """
 import pytest
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
+from sqlalchemy.orm import Session
 from app.services.document_processor import DocumentProcessor
+from app.services.table_parser import TableParser
+from app.services.vector_store import VectorStore
 
 
-class TestDocumentProcessor:
-    """Test suite for DocumentProcessor"""
+class _FakePage:
+    """Minimal stand-in for a pdfplumber page"""
+
+    def __init__(self, text="", tables=(), error=None):
+        self.text = text
+        self.tables = list(tables)
+        self.error = error
+
+    def extract_tables(self):
+        if self.error is not None:
+            raise self.error
+        return self.tables
+
+    def extract_text(self):
+        return self.text
+
+    def flush_cache(self):
+        pass
+
+
+class _FakePDF:
+    """Minimal stand-in for an open pdfplumber document"""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __enter__(self):
+        return self
 
-    @pytest.fixture
-    def mock_db(self):
-        """Create mock database session"""
-        db = Mock()
-        return db
+    def __exit__(self, *exc_info):
+        return False
 
-    @pytest.fixture
-    def processor(self, mock_db):
-        """Create DocumentProcessor instance with mocked dependencies"""
-        with patch('app.services.document_processor.TableParser'), \
-             patch('app.services.document_processor.VectorStore'):
-            return DocumentProcessor(mock_db)
+
+def executed_statuses(mock_db):
+    """Return the parsing_status values written by UPDATE statements on a mock session"""
+    statuses = []
+    for call in mock_db.execute.call_args_list:
+        params = call.args[0].compile().params
+        if "parsing_status" in params:
+            statuses.append(params["parsing_status"])
+    return statuses
+
+
+@pytest.fixture(scope="module")
+def processor():
+    """
+    Create one DocumentProcessor with mocked dependencies for the module
+
+    TableParser and VectorStore stay patched for the module's lifetime;
+    _rebind_processor gives every test its own session and mocks.
+    """
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr('app.services.document_processor.TableParser', MagicMock())
+    monkeypatch.setattr('app.services.document_processor.VectorStore', MagicMock())
+    try:
+        yield DocumentProcessor(Mock(spec=Session))
+    finally:
+        monkeypatch.undo()
+
+
+@pytest.fixture
+def mock_db():
+    """Create mock database session"""
+    return Mock(spec=Session)
+
+
+@pytest.fixture(autouse=True)
+def _rebind_processor(processor, mock_db):
+    """Point the shared processor at this test's session and fresh mocks"""
+    processor.db = mock_db
+    processor.table_parser = Mock(spec=TableParser)
+    processor.vector_store = Mock(spec=VectorStore, add_documents=AsyncMock())
+    processor.pdf_opener = None
+
+
+class TestDocumentProcessor:
+    """Test suite for DocumentProcessor"""
 
     # ==================== Text Cleaning Tests ====================
 
@@ -44,7 +109,7 @@ class TestDocumentProcessor:
 
     def test_clean_text_normalizes_quotes(self, processor):
         """Test quote normalization"""
-        text = '"Smart quotes" and 'single quotes''
+        text = '\u201cSmart quotes\u201d and \u2018single quotes\u2019'
         result = processor._clean_text(text)
         assert '"Smart quotes"' in result
         assert "'" in result
@@ -206,105 +271,45 @@ class TestDocumentProcessor:
 
     # ==================== Integration Tests (Mocked) ====================
 
-    @pytest.mark.asyncio
     async def test_process_document_updates_status(self, processor, mock_db):
         """Test that document status is updated during processing"""
-        from app.models.document import Document
-
-        # Mock document
-        mock_doc = Mock(spec=Document)
-        mock_doc.id = 1
-        mock_doc.parsing_status = "pending"
-
-        # Mock database query
-        mock_query = Mock()
-        mock_query.filter.return_value.first.return_value = mock_doc
-        mock_db.query.return_value = mock_query
-
-        # Mock pdfplumber
-        mock_pdf = MagicMock()
-        mock_page = MagicMock()
-        mock_page.extract_tables.return_value = []
-        mock_page.extract_text.return_value = ""
-        mock_pdf.pages = [mock_page]
-        mock_pdf.__enter__.return_value = mock_pdf
-
-        with patch('pdfplumber.open', return_value=mock_pdf):
-            # Mock vector store
-            processor.vector_store.add_document = AsyncMock()
-
-            try:
-                result = await processor.process_document(
-                    file_path="/fake/path.pdf",
-                    document_id=1,
-                    fund_id=1
-                )
-
-                # Status should be set to processing, then completed
-                assert mock_doc.parsing_status == "completed"
-                assert mock_db.commit.called
-
-            except Exception:
-                # If error occurs, status should be failed
-                pass
-
-    @pytest.mark.asyncio
-    async def test_process_document_handles_page_errors(self, processor, mock_db):
-        """Test that page-level errors don't stop processing"""
-        from app.models.document import Document
+        processor.pdf_opener = lambda path: _FakePDF([_FakePage()])
 
-        # Mock document
-        mock_doc = Mock(spec=Document)
-        mock_doc.id = 1
+        await processor.process_document(
+            file_path="/fake/path.pdf",
+            document_id=1,
+            fund_id=1
+        )
 
-        mock_query = Mock()
-        mock_query.filter.return_value.first.return_value = mock_doc
-        mock_db.query.return_value = mock_query
+        # Status should be set to processing, then completed
+        assert executed_statuses(mock_db) == ["processing", "completed"]
+        assert mock_db.commit.called
 
+    async def test_process_document_handles_page_errors(self, processor, mock_db):
+        """Test that page-level errors don't stop processing"""
         # Create pages where one throws error
-        mock_page_1 = MagicMock()
-        mock_page_1.extract_tables.return_value = []
-        mock_page_1.extract_text.return_value = "Page 1 text"
-
-        mock_page_2 = MagicMock()
-        mock_page_2.extract_tables.side_effect = Exception("Page 2 error")
-
-        mock_page_3 = MagicMock()
-        mock_page_3.extract_tables.return_value = []
-        mock_page_3.extract_text.return_value = "Page 3 text"
-
-        mock_pdf = MagicMock()
-        mock_pdf.pages = [mock_page_1, mock_page_2, mock_page_3]
-        mock_pdf.__enter__.return_value = mock_pdf
-
-        with patch('pdfplumber.open', return_value=mock_pdf):
-            processor.vector_store.add_document = AsyncMock()
+        pages = [
+            _FakePage(text="Page 1 text"),
+            _FakePage(error=Exception("Page 2 error")),
+            _FakePage(text="Page 3 text"),
+        ]
+        processor.pdf_opener = lambda path: _FakePDF(pages)
 
-            result = await processor.process_document(
-                file_path="/fake/path.pdf",
-                document_id=1,
-                fund_id=1
-            )
+        result = await processor.process_document(
+            file_path="/fake/path.pdf",
+            document_id=1,
+            fund_id=1
+        )
 
-            # Should process pages 1 and 3, skip page 2
-            assert result["pages_processed"] == 2
-            assert len(result["errors"]) > 0
-            assert "Page 2 error" in str(result["errors"])
+        # Should process pages 1 and 3, skip page 2
+        assert result["pages_processed"] == 2
+        assert len(result["errors"]) > 0
+        assert "Page 2 error" in str(result["errors"])
 
 
 class TestDocumentProcessorEdgeCases:
     """Test edge cases and error scenarios"""
 
-    @pytest.fixture
-    def mock_db(self):
-        return Mock()
-
-    @pytest.fixture
-    def processor(self, mock_db):
-        with patch('app.services.document_processor.TableParser'), \
-             patch('app.services.document_processor.VectorStore'):
-            return DocumentProcessor(mock_db)
-
     def test_chunk_text_single_very_long_sentence(self, processor):
         """Test chunking a single sentence longer than chunk_size"""
         # Create one sentence > 1000 characters
@@ -346,16 +351,8 @@ class TestDocumentProcessorEdgeCases:
         # Should handle gracefully
         assert isinstance(result, list)
 
-    @pytest.mark.asyncio
     async def test_process_document_file_not_found(self, processor, mock_db):
         """Test processing non-existent file"""
-        from app.models.document import Document
-
-        mock_doc = Mock(spec=Document)
-        mock_query = Mock()
-        mock_query.filter.return_value.first.return_value = mock_doc
-        mock_db.query.return_value = mock_query
-
         with pytest.raises(Exception):
             await processor.process_document(
                 file_path="/nonexistent/file.pdf",
@@ -364,19 +361,12 @@ class TestDocumentProcessorEdgeCases:
             )
 
         # Status should be set to failed
-        assert mock_doc.parsing_status == "failed"
+        assert executed_statuses(mock_db)[-1] == "failed"
 
 
 class TestTextChunkingScenarios:
     """Test realistic text chunking scenarios"""
 
-    @pytest.fixture
-    def processor(self):
-        mock_db = Mock()
-        with patch('app.services.document_processor.TableParser'), \
-             patch('app.services.document_processor.VectorStore'):
-            return DocumentProcessor(mock_db)
-
     def test_chunk_fund_report_text(self, processor):
         """Test chunking realistic fund report text"""
         report_text = """
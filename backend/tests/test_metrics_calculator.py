@@ -10,312 +10,248 @@ Tests financial metrics calculations:
 import pytest
 from decimal import Decimal
 from datetime import date
-from unittest.mock import Mock
+from math import isclose
+from dataclasses import asdict, dataclass
+from typing import Optional
+from sqlalchemy import insert
+
+# MetricsCalculator imports numpy-financial for IRR; skip rather than error without it
+npf = pytest.importorskip("numpy_financial")
+
+from app.models.fund import Fund
+from app.models.transaction import CapitalCall, Distribution, Adjustment
 from app.services.metrics_calculator import MetricsCalculator
 
 
-class TestMetricsCalculator:
-    """Test suite for MetricsCalculator"""
+# Date given to transactions whose test does not care when they happened
+DEFAULT_DATE = date(2024, 1, 1)
 
-    @pytest.fixture
-    def mock_db(self):
-        """Create mock database session"""
-        return Mock()
 
-    @pytest.fixture
-    def calculator(self, mock_db):
-        """Create MetricsCalculator instance"""
-        return MetricsCalculator(mock_db)
+@dataclass(frozen=True, slots=True)
+class Row:
+    """Transaction to insert; unset dates become DEFAULT_DATE"""
+    amount: Decimal
+    call_date: Optional[date] = None
+    distribution_date: Optional[date] = None
+    adjustment_date: Optional[date] = None
+    call_type: Optional[str] = None
+    distribution_type: Optional[str] = None
+    adjustment_type: Optional[str] = None
+    is_recallable: Optional[bool] = None
+    description: Optional[str] = None
 
-    # ==================== PIC Calculation Tests ====================
 
-    def test_calculate_pic_simple(self, calculator, mock_db):
-        """Test simple PIC calculation"""
-        # Mock capital calls
-        mock_call_1 = Mock()
-        mock_call_1.amount = Decimal("1000000")
+# Cash flows shared by the IRR tests; Row is frozen, so tests cannot alter them
+CALL_1M_JAN = Row(call_date=date(2024, 1, 1), amount=Decimal("1000000"), call_type="Investment")
+DIST_1_2M_DEC = Row(distribution_date=date(2024, 12, 31), amount=Decimal("1200000"), distribution_type="Return of Capital")
 
-        mock_call_2 = Mock()
-        mock_call_2.amount = Decimal("500000")
+_DATE_COLUMNS = {
+    CapitalCall: "call_date",
+    Distribution: "distribution_date",
+    Adjustment: "adjustment_date",
+}
 
-        mock_db.query().filter().all.return_value = [mock_call_1, mock_call_2]
 
-        # Mock adjustments (empty)
-        mock_db.query().filter().filter().all.return_value = []
+def _row_values(model, row: Row, fund_id: int) -> dict:
+    """INSERT values for row: the fields model has, with its date defaulted"""
+    values = {
+        key: value for key, value in asdict(row).items()
+        if value is not None and hasattr(model, key)
+    }
+    values.setdefault(_DATE_COLUMNS[model], DEFAULT_DATE)
+    return {"fund_id": fund_id, **values}
 
-        result = calculator.calculate_pic(fund_id=1)
 
-        assert result == Decimal("1500000")
+def _insert_rows(db, fund_id: int, *, calls=(), distributions=(), adjustments=()):
+    """Insert each table's rows for fund_id with one INSERT per table and commit"""
+    for model, rows in ((CapitalCall, calls), (Distribution, distributions), (Adjustment, adjustments)):
+        if rows:
+            db.execute(insert(model), [_row_values(model, row, fund_id) for row in rows])
+    db.commit()
 
-    def test_calculate_pic_with_adjustments(self, calculator, mock_db):
-        """Test PIC calculation with contribution adjustments"""
-        # Mock capital calls
-        mock_call = Mock()
-        mock_call.amount = Decimal("1000000")
 
-        # Mock adjustments
-        mock_adj_1 = Mock()
-        mock_adj_1.amount = Decimal("50000")  # Positive adjustment
+@pytest.fixture
+def fund_id(test_db):
+    """
+    Id of the fund under test
 
-        mock_adj_2 = Mock()
-        mock_adj_2.amount = Decimal("-25000")  # Negative adjustment
+    A second fund with one transaction of each type is created alongside
+    it, so every query has to filter by fund to get the expected totals.
+    """
+    fund, other_fund = Fund(name="Unit Test Fund"), Fund(name="Other Fund")
+    test_db.add_all([fund, other_fund])
+    test_db.commit()
 
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().all.return_value = [mock_call]
-            else:  # Adjustment
-                query_mock.filter().filter().all.return_value = [mock_adj_1, mock_adj_2]
-            return query_mock
+    _insert_rows(
+        test_db, other_fund.id,
+        calls=[Row(amount=Decimal("10000000000"))],
+        distributions=[Row(amount=Decimal("8500000000"))],
+        adjustments=[Row(amount=Decimal("1000000"))],
+    )
+    return fund.id
 
-        mock_db.query.side_effect = query_side_effect
 
-        result = calculator.calculate_pic(fund_id=1)
+@pytest.fixture
+def load(test_db, fund_id):
+    """Insert the given transactions for the fund under test"""
+    def load(*, calls=(), distributions=(), adjustments=()):
+        _insert_rows(test_db, fund_id, calls=calls, distributions=distributions, adjustments=adjustments)
+    return load
 
-        # PIC = 1,000,000 + 50,000 - 25,000 = 1,025,000
-        assert result == Decimal("1025000")
 
-    def test_calculate_pic_no_calls(self, calculator, mock_db):
-        """Test PIC calculation with no capital calls"""
-        mock_db.query().filter().all.return_value = []
-        mock_db.query().filter().filter().all.return_value = []
+@pytest.fixture
+def calculator(test_db):
+    """Create MetricsCalculator instance on the test session"""
+    return MetricsCalculator(test_db)
 
-        result = calculator.calculate_pic(fund_id=1)
 
-        assert result == Decimal("0")
+class TestMetricsCalculator:
+    """Test suite for MetricsCalculator"""
 
-    # ==================== Total Distributions Tests ====================
+    # ==================== PIC Calculation Tests ====================
 
-    def test_calculate_total_distributions(self, calculator, mock_db):
-        """Test total distributions calculation"""
-        mock_dist_1 = Mock()
-        mock_dist_1.amount = Decimal("500000")
+    @pytest.mark.parametrize("amounts, expected", [
+        pytest.param([Decimal("1000000"), Decimal("500000")], 1_500_000, id="simple"),
+        pytest.param([], 0, id="no_calls"),
+        pytest.param([Decimal("0")], 0, id="zero_amounts"),
+    ])
+    def test_calculate_pic_sums_capital_calls(self, calculator, load, fund_id, amounts, expected):
+        """Test PIC is the sum of capital calls when there are no adjustments"""
+        load(calls=[Row(amount=amount) for amount in amounts])
 
-        mock_dist_2 = Mock()
-        mock_dist_2.amount = Decimal("750000")
+        result = calculator.calculate_pic(fund_id=fund_id)
 
-        mock_db.query().filter().all.return_value = [mock_dist_1, mock_dist_2]
+        assert result == expected
 
-        result = calculator.calculate_total_distributions(fund_id=1)
+    def test_calculate_pic_with_adjustments(self, calculator, load, fund_id):
+        """Test PIC calculation with contribution adjustments"""
+        # Capital calls
+        call = Row(amount=Decimal("1000000"))
 
-        assert result == Decimal("1250000")
+        # Adjustments
+        adjustment_1 = Row(amount=Decimal("50000"))  # Positive adjustment
 
-    def test_calculate_total_distributions_none(self, calculator, mock_db):
-        """Test distributions with no data"""
-        mock_db.query().filter().all.return_value = []
+        adjustment_2 = Row(amount=Decimal("-25000"))  # Negative adjustment
 
-        result = calculator.calculate_total_distributions(fund_id=1)
+        load(calls=[call], adjustments=[adjustment_1, adjustment_2])
 
-        assert result == Decimal("0")
+        result = calculator.calculate_pic(fund_id=fund_id)
 
-    # ==================== DPI Calculation Tests ====================
+        # PIC = 1,000,000 + 50,000 - 25,000 = 1,025,000
+        assert result == 1_025_000
 
-    def test_calculate_dpi_simple(self, calculator, mock_db):
-        """Test simple DPI calculation"""
-        # Mock capital calls for PIC
-        mock_call = Mock()
-        mock_call.amount = Decimal("1000000")
+    # ==================== Total Distributions Tests ====================
 
-        # Mock distributions
-        mock_dist = Mock()
-        mock_dist.amount = Decimal("850000")
+    def test_calculate_total_distributions(self, calculator, load, fund_id):
+        """Test total distributions calculation"""
+        distribution_1 = Row(amount=Decimal("500000"))
 
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().all.return_value = [mock_call]
-            elif args[0].__name__ == 'Distribution':
-                query_mock.filter().all.return_value = [mock_dist]
-            else:  # Adjustment
-                query_mock.filter().filter().all.return_value = []
-            return query_mock
+        distribution_2 = Row(amount=Decimal("750000"))
 
-        mock_db.query.side_effect = query_side_effect
+        load(distributions=[distribution_1, distribution_2])
 
-        result = calculator.calculate_dpi(fund_id=1)
+        result = calculator.calculate_total_distributions(fund_id=fund_id)
 
-        # DPI = 850,000 / 1,000,000 = 0.85
-        assert result == pytest.approx(0.85, rel=1e-9)
+        assert result == 1_250_000
 
-    def test_calculate_dpi_zero_pic(self, calculator, mock_db):
-        """Test DPI calculation with zero PIC"""
-        mock_db.query().filter().all.return_value = []
-        mock_db.query().filter().filter().all.return_value = []
+    def test_calculate_total_distributions_none(self, calculator, fund_id):
+        """Test distributions with no data"""
+        result = calculator.calculate_total_distributions(fund_id=fund_id)
 
-        result = calculator.calculate_dpi(fund_id=1)
+        assert result == 0
 
-        # Should return 0.0 when PIC is zero
-        assert result == 0.0
+    # ==================== DPI Calculation Tests ====================
 
-    def test_calculate_dpi_greater_than_one(self, calculator, mock_db):
-        """Test DPI > 1 (distributions exceed capital called)"""
-        # Mock capital calls
-        mock_call = Mock()
-        mock_call.amount = Decimal("1000000")
+    @pytest.mark.parametrize("call_amount, dist_amount, expected_dpi", [
+        pytest.param(Decimal("1000000"), Decimal("850000"), 0.85, id="simple"),
+        # Distributions exceed capital called
+        pytest.param(Decimal("1000000"), Decimal("1500000"), 1.5, id="greater_than_one"),
+        # Very small PIC (edge of zero division): 1 cent called
+        pytest.param(Decimal("0.01"), Decimal("0.02"), 2.0, id="very_small_pic"),
+        # $10 billion capital call
+        pytest.param(Decimal("10000000000"), Decimal("8500000000"), 0.85, id="large_amounts"),
+    ])
+    def test_calculate_dpi(self, calculator, load, fund_id, call_amount, dist_amount, expected_dpi):
+        """Test DPI = distributions / PIC across amount scales"""
+        load(calls=[Row(amount=call_amount)], distributions=[Row(amount=dist_amount)])
 
-        # Mock distributions (greater than calls)
-        mock_dist = Mock()
-        mock_dist.amount = Decimal("1500000")
+        assert calculator.calculate_pic(fund_id=fund_id) == call_amount
 
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().all.return_value = [mock_call]
-            elif args[0].__name__ == 'Distribution':
-                query_mock.filter().all.return_value = [mock_dist]
-            else:
-                query_mock.filter().filter().all.return_value = []
-            return query_mock
+        result = calculator.calculate_dpi(fund_id=fund_id)
 
-        mock_db.query.side_effect = query_side_effect
+        assert isclose(result, expected_dpi, rel_tol=1e-9)
 
-        result = calculator.calculate_dpi(fund_id=1)
+    def test_calculate_dpi_zero_pic(self, calculator, fund_id):
+        """Test DPI calculation with zero PIC"""
+        result = calculator.calculate_dpi(fund_id=fund_id)
 
-        # DPI = 1,500,000 / 1,000,000 = 1.5
-        assert result == pytest.approx(1.5, rel=1e-9)
+        # Should return 0.0 when PIC is zero
+        assert result == 0.0
 
     # ==================== IRR Calculation Tests ====================
 
-    def test_calculate_irr_simple(self, calculator, mock_db):
-        """Test simple IRR calculation"""
-        # Capital call (negative cash flow)
-        mock_call = Mock()
-        mock_call.call_date = date(2024, 1, 1)
-        mock_call.amount = Decimal("1000000")
-
-        # Distribution (positive cash flow)
-        mock_dist = Mock()
-        mock_dist.distribution_date = date(2024, 12, 31)
-        mock_dist.amount = Decimal("1200000")
-
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().order_by().all.return_value = [mock_call]
-            elif args[0].__name__ == 'Distribution':
-                query_mock.filter().order_by().all.return_value = [mock_dist]
-            else:
-                query_mock.filter().filter().order_by().all.return_value = []
-            return query_mock
-
-        mock_db.query.side_effect = query_side_effect
-
-        result = calculator.calculate_irr(fund_id=1)
-
-        # IRR should be positive (around 20% for this scenario)
-        assert result is not None
-        assert result > 0
-        assert result < 1  # Less than 100%
-
-    def test_calculate_irr_negative(self, calculator, mock_db):
-        """Test IRR calculation with loss"""
-        # Capital call
-        mock_call = Mock()
-        mock_call.call_date = date(2024, 1, 1)
-        mock_call.amount = Decimal("1000000")
-
-        # Distribution (less than capital)
-        mock_dist = Mock()
-        mock_dist.distribution_date = date(2024, 12, 31)
-        mock_dist.amount = Decimal("800000")
-
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().order_by().all.return_value = [mock_call]
-            elif args[0].__name__ == 'Distribution':
-                query_mock.filter().order_by().all.return_value = [mock_dist]
-            else:
-                query_mock.filter().filter().order_by().all.return_value = []
-            return query_mock
-
-        mock_db.query.side_effect = query_side_effect
-
-        result = calculator.calculate_irr(fund_id=1)
-
-        # IRR should be negative
+    @pytest.mark.parametrize("dist_amount, lower, upper", [
+        # Gain: positive, around 20%, less than 100%
+        pytest.param(DIST_1_2M_DEC.amount, 0, 1, id="simple"),
+        # Loss: distribution less than capital
+        pytest.param(Decimal("800000"), float("-inf"), 0, id="negative"),
+    ])
+    def test_calculate_irr(self, calculator, load, fund_id, dist_amount, lower, upper):
+        """Test IRR for one capital call and one distribution a year later"""
+        # Capital call (negative cash flow), distribution (positive cash flow)
+        load(
+            calls=[CALL_1M_JAN],
+            distributions=[Row(distribution_date=date(2024, 12, 31), amount=dist_amount)],
+        )
+
+        result = calculator.calculate_irr(fund_id=fund_id)
+
         assert result is not None
-        assert result < 0
+        assert lower < result < upper
 
-    def test_calculate_irr_insufficient_data(self, calculator, mock_db):
+    def test_calculate_irr_insufficient_data(self, calculator, load, fund_id):
         """Test IRR with insufficient cash flows"""
         # Only one cash flow
-        mock_call = Mock()
-        mock_call.call_date = date(2024, 1, 1)
-        mock_call.amount = Decimal("1000000")
-
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().order_by().all.return_value = [mock_call]
-            else:
-                query_mock.filter().order_by().all.return_value = []
-                query_mock.filter().filter().order_by().all.return_value = []
-            return query_mock
+        load(calls=[CALL_1M_JAN])
 
-        mock_db.query.side_effect = query_side_effect
-
-        result = calculator.calculate_irr(fund_id=1)
+        result = calculator.calculate_irr(fund_id=fund_id)
 
         # Should return None when insufficient data
         assert result is None
 
-    def test_calculate_irr_all_positive_flows(self, calculator, mock_db):
+    def test_calculate_irr_all_positive_flows(self, calculator, load, fund_id):
         """Test IRR with all positive cash flows (invalid)"""
         # All distributions, no calls
-        mock_dist_1 = Mock()
-        mock_dist_1.distribution_date = date(2024, 1, 1)
-        mock_dist_1.amount = Decimal("500000")
-
-        mock_dist_2 = Mock()
-        mock_dist_2.distribution_date = date(2024, 6, 1)
-        mock_dist_2.amount = Decimal("750000")
+        distribution_1 = Row(
+            distribution_date=date(2024, 1, 1),
+            amount=Decimal("500000"),
+        )
 
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'Distribution':
-                query_mock.filter().order_by().all.return_value = [mock_dist_1, mock_dist_2]
-            else:
-                query_mock.filter().order_by().all.return_value = []
-                query_mock.filter().filter().order_by().all.return_value = []
-            return query_mock
+        distribution_2 = Row(
+            distribution_date=date(2024, 6, 1),
+            amount=Decimal("750000"),
+        )
 
-        mock_db.query.side_effect = query_side_effect
+        load(distributions=[distribution_1, distribution_2])
 
-        result = calculator.calculate_irr(fund_id=1)
+        result = calculator.calculate_irr(fund_id=fund_id)
 
         # Should return None (can't calculate IRR with all positive flows)
         assert result is None
 
     # ==================== Calculate All Metrics Tests ====================
 
-    def test_calculate_all_metrics(self, calculator, mock_db):
+    def test_calculate_all_metrics(self, calculator, load, fund_id):
         """Test calculating all metrics at once"""
-        # Setup mock data
-        mock_call = Mock()
-        mock_call.call_date = date(2024, 1, 1)
-        mock_call.amount = Decimal("1000000")
-
-        mock_dist = Mock()
-        mock_dist.distribution_date = date(2024, 12, 31)
-        mock_dist.amount = Decimal("850000")
-
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().all.return_value = [mock_call]
-                query_mock.filter().order_by().all.return_value = [mock_call]
-            elif args[0].__name__ == 'Distribution':
-                query_mock.filter().all.return_value = [mock_dist]
-                query_mock.filter().order_by().all.return_value = [mock_dist]
-            else:
-                query_mock.filter().filter().all.return_value = []
-                query_mock.filter().filter().order_by().all.return_value = []
-            return query_mock
-
-        mock_db.query.side_effect = query_side_effect
-
-        result = calculator.calculate_all_metrics(fund_id=1)
+        # Setup data
+        distribution = Row(
+            distribution_date=date(2024, 12, 31),
+            amount=Decimal("850000"),
+        )
+
+        load(calls=[CALL_1M_JAN], distributions=[distribution])
+
+        result = calculator.calculate_all_metrics(fund_id=fund_id)
 
         # Should return all metrics
         assert "pic" in result
@@ -326,84 +262,45 @@ class TestMetricsCalculator:
         # Verify values
         assert result["pic"] == 1000000.0
         assert result["total_distributions"] == 850000.0
-        assert result["dpi"] == pytest.approx(0.85, rel=1e-9)
+        assert isclose(result["dpi"], 0.85, rel_tol=1e-9)
 
     # ==================== Calculation Breakdown Tests ====================
 
-    def test_get_calculation_breakdown_dpi(self, calculator, mock_db):
+    def test_get_calculation_breakdown_dpi(self, calculator, load, fund_id):
         """Test detailed DPI calculation breakdown"""
-        # Setup mock data
-        mock_call = Mock()
-        mock_call.call_date = date(2024, 1, 15)
-        mock_call.amount = Decimal("1000000")
-        mock_call.call_type = "Investment"
-        mock_call.description = "Initial capital call"
-
-        mock_dist = Mock()
-        mock_dist.distribution_date = date(2024, 6, 20)
-        mock_dist.amount = Decimal("850000")
-        mock_dist.distribution_type = "Return of Capital"
-        mock_dist.description = "Q2 distribution"
-
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().all.return_value = [mock_call]
-                query_mock.filter().order_by().all.return_value = [mock_call]
-            elif args[0].__name__ == 'Distribution':
-                query_mock.filter().all.return_value = [mock_dist]
-                query_mock.filter().order_by().all.return_value = [mock_dist]
-            else:
-                query_mock.filter().filter().all.return_value = []
-                query_mock.filter().filter().order_by().all.return_value = []
-            return query_mock
-
-        mock_db.query.side_effect = query_side_effect
-
-        result = calculator.get_calculation_breakdown(fund_id=1, metric="dpi")
-
-        # Should include breakdown details
-        assert result["metric"] == "dpi"
-        assert "value" in result
-        assert "capital_calls" in result
-        assert "distributions" in result
-        assert "calculation_steps" in result
-
-        # Verify capital calls data
-        assert len(result["capital_calls"]) == 1
-        assert result["capital_calls"][0]["amount"] == 1000000.0
-
-        # Verify distributions data
-        assert len(result["distributions"]) == 1
-        assert result["distributions"][0]["amount"] == 850000.0
-
-    def test_get_calculation_breakdown_irr(self, calculator, mock_db):
+        # Setup data
+        call = Row(
+            call_date=date(2024, 1, 15),
+            amount=Decimal("1000000"),
+            call_type="Investment",
+            description="Initial capital call",
+        )
+
+        distribution = Row(
+            distribution_date=date(2024, 6, 20),
+            amount=Decimal("850000"),
+            distribution_type="Return of Capital",
+            description="Q2 distribution",
+        )
+
+        load(calls=[call], distributions=[distribution])
+
+        result = calculator.get_calculation_breakdown(fund_id=fund_id, metric="dpi")
+
+        # Breakdown details, plus exactly one capital call and one distribution
+        expected_keys = {"metric", "value", "capital_calls", "distributions", "calculation_steps"}
+        assert (
+            expected_keys <= result.keys()
+            and result["metric"] == "dpi"
+            and [call["amount"] for call in result["capital_calls"]] == [1_000_000.0]
+            and [dist["amount"] for dist in result["distributions"]] == [850_000.0]
+        ), result
+
+    def test_get_calculation_breakdown_irr(self, calculator, load, fund_id):
         """Test detailed IRR calculation breakdown"""
-        mock_call = Mock()
-        mock_call.call_date = date(2024, 1, 1)
-        mock_call.amount = Decimal("1000000")
-        mock_call.call_type = "Investment"
-        mock_call.description = None
-
-        mock_dist = Mock()
-        mock_dist.distribution_date = date(2024, 12, 31)
-        mock_dist.amount = Decimal("1200000")
-        mock_dist.distribution_type = "Return of Capital"
-        mock_dist.description = None
-
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().order_by().all.return_value = [mock_call]
-            elif args[0].__name__ == 'Distribution':
-                query_mock.filter().order_by().all.return_value = [mock_dist]
-            else:
-                query_mock.filter().filter().order_by().all.return_value = []
-            return query_mock
-
-        mock_db.query.side_effect = query_side_effect
-
-        result = calculator.get_calculation_breakdown(fund_id=1, metric="irr")
+        load(calls=[CALL_1M_JAN], distributions=[DIST_1_2M_DEC])
+
+        result = calculator.get_calculation_breakdown(fund_id=fund_id, metric="irr")
 
         # Should include IRR-specific data
         assert result["metric"] == "irr"
@@ -413,8 +310,11 @@ class TestMetricsCalculator:
         # Should have cash flow timeline
         assert len(result["cash_flows"]) == 2
 
-    def test_get_calculation_breakdown_invalid_metric(self, calculator, mock_db):
+    def test_get_calculation_breakdown_invalid_metric(self):
         """Test breakdown with invalid metric name"""
+        # Rejected before any query, so no session is needed
+        calculator = MetricsCalculator(None)
+
         result = calculator.get_calculation_breakdown(fund_id=1, metric="invalid_metric")
 
         # Should return error
@@ -424,106 +324,35 @@ class TestMetricsCalculator:
 class TestMetricsCalculatorEdgeCases:
     """Test edge cases and boundary conditions"""
 
-    @pytest.fixture
-    def mock_db(self):
-        return Mock()
-
-    @pytest.fixture
-    def calculator(self, mock_db):
-        return MetricsCalculator(mock_db)
-
-    def test_calculate_pic_with_zero_amounts(self, calculator, mock_db):
-        """Test PIC with zero-amount capital calls"""
-        mock_call = Mock()
-        mock_call.amount = Decimal("0")
-
-        mock_db.query().filter().all.return_value = [mock_call]
-        mock_db.query().filter().filter().all.return_value = []
-
-        result = calculator.calculate_pic(fund_id=1)
-
-        assert result == Decimal("0")
-
-    def test_calculate_dpi_with_very_small_pic(self, calculator, mock_db):
-        """Test DPI with very small PIC (edge of zero division)"""
-        mock_call = Mock()
-        mock_call.amount = Decimal("0.01")  # 1 cent
-
-        mock_dist = Mock()
-        mock_dist.amount = Decimal("0.02")
-
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().all.return_value = [mock_call]
-            elif args[0].__name__ == 'Distribution':
-                query_mock.filter().all.return_value = [mock_dist]
-            else:
-                query_mock.filter().filter().all.return_value = []
-            return query_mock
-
-        mock_db.query.side_effect = query_side_effect
-
-        result = calculator.calculate_dpi(fund_id=1)
-
-        # Should calculate correctly even with tiny amounts
-        assert result == pytest.approx(2.0, rel=1e-9)
-
-    def test_calculate_metrics_with_large_amounts(self, calculator, mock_db):
-        """Test calculations with very large amounts"""
-        # $10 billion capital call
-        mock_call = Mock()
-        mock_call.amount = Decimal("10000000000")
-
-        mock_dist = Mock()
-        mock_dist.amount = Decimal("8500000000")
-
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().all.return_value = [mock_call]
-            elif args[0].__name__ == 'Distribution':
-                query_mock.filter().all.return_value = [mock_dist]
-            else:
-                query_mock.filter().filter().all.return_value = []
-            return query_mock
-
-        mock_db.query.side_effect = query_side_effect
-
-        pic = calculator.calculate_pic(fund_id=1)
-        dpi = calculator.calculate_dpi(fund_id=1)
-
-        # Should handle large amounts correctly
-        assert pic == Decimal("10000000000")
-        assert dpi == pytest.approx(0.85, rel=1e-9)
-
-    def test_calculate_irr_same_date_flows(self, calculator, mock_db):
+    def test_calculate_irr_same_date_flows(self, calculator, load, fund_id):
         """Test IRR when all cash flows on same date"""
-        same_date = date(2024, 1, 1)
-
-        mock_call = Mock()
-        mock_call.call_date = same_date
-        mock_call.amount = Decimal("1000000")
+        # Distribution on the capital call's date
+        distribution = Row(
+            distribution_date=CALL_1M_JAN.call_date,
+            amount=Decimal("1200000"),
+        )
 
-        mock_dist = Mock()
-        mock_dist.distribution_date = same_date
-        mock_dist.amount = Decimal("1200000")
+        load(calls=[CALL_1M_JAN], distributions=[distribution])
 
-        def query_side_effect(*args):
-            query_mock = Mock()
-            if args[0].__name__ == 'CapitalCall':
-                query_mock.filter().order_by().all.return_value = [mock_call]
-            elif args[0].__name__ == 'Distribution':
-                query_mock.filter().order_by().all.return_value = [mock_dist]
-            else:
-                query_mock.filter().filter().order_by().all.return_value = []
-            return query_mock
-
-        mock_db.query.side_effect = query_side_effect
-
-        result = calculator.calculate_irr(fund_id=1)
+        result = calculator.calculate_irr(fund_id=fund_id)
 
         # IRR calculation may fail or return None for same-date flows
         # This is expected behavior (undefined mathematically)
         # The function should handle gracefully
         assert result is None or isinstance(result, (float, type(None)))
+
+    def test_calculate_irr_interleaved_flows(self, calculator, load, fund_id):
+        """Test IRR matches numpy-financial when calls and distributions alternate"""
+        calls = [Row(call_date=date(2024, month, 1), amount=Decimal("1000000")) for month in (1, 3, 5)]
+        distributions = [
+            Row(distribution_date=date(2024, 2, 1), amount=Decimal("200000")),
+            Row(distribution_date=date(2024, 4, 1), amount=Decimal("300000")),
+            Row(distribution_date=date(2024, 12, 1), amount=Decimal("2900000")),
+        ]
+        load(calls=calls, distributions=distributions)
+
+        result = calculator.calculate_irr(fund_id=fund_id)
+
+        # Flows in date order: several sign changes, one IRR
+        flows = [-1_000_000, 200_000, -1_000_000, 300_000, -1_000_000, 2_900_000]
+        assert result == round(npf.irr(flows) * 100, 2)
@@ -6,6 +6,10 @@ Tests metrics calculations with actual database data using SQLite fixtures
 import pytest
 from decimal import Decimal
 from datetime import date
+
+# MetricsCalculator imports numpy-financial for IRR; skip rather than error without it
+pytest.importorskip("numpy_financial")
+
 from app.services.metrics_calculator import MetricsCalculator
 
 
@@ -200,20 +204,20 @@ class TestMetricsCalculatorIntegration:
 class TestMetricsCalculatorScenarios:
     """Test specific fund scenarios"""
 
-    def test_profitable_fund_scenario(self, test_db, sample_fund):
+    def test_profitable_fund_scenario(self, test_db, class_fund):
         """Test metrics for a profitable fund (DPI > 1)"""
         from tests.conftest import create_capital_call, create_distribution
 
         # Create capital calls: $1M total
-        create_capital_call(test_db, sample_fund.id, date(2024, 1, 1), Decimal("1000000"))
+        create_capital_call(test_db, class_fund.id, date(2024, 1, 1), Decimal("1000000"))
 
         # Create distributions: $1.5M total (50% profit)
-        create_distribution(test_db, sample_fund.id, date(2024, 6, 1), Decimal("1500000"))
+        create_distribution(test_db, class_fund.id, date(2024, 6, 1), Decimal("1500000"))
 
         calculator = MetricsCalculator(test_db)
 
         # Calculate metrics
-        metrics = calculator.calculate_all_metrics(sample_fund.id)
+        metrics = calculator.calculate_all_metrics(class_fund.id)
 
         # PIC = 1M
         assert metrics["pic"] == 1000000.0
@@ -228,20 +232,20 @@ class TestMetricsCalculatorScenarios:
         if metrics["irr"] is not None:
             assert metrics["irr"] > 0
 
-    def test_underwater_fund_scenario(self, test_db, sample_fund):
+    def test_underwater_fund_scenario(self, test_db, class_fund):
         """Test metrics for an underwater fund (DPI < 1)"""
         from tests.conftest import create_capital_call, create_distribution
 
         # Create capital calls: $1M total
-        create_capital_call(test_db, sample_fund.id, date(2024, 1, 1), Decimal("1000000"))
+        create_capital_call(test_db, class_fund.id, date(2024, 1, 1), Decimal("1000000"))
 
         # Create distributions: $500K total (50% loss)
-        create_distribution(test_db, sample_fund.id, date(2024, 12, 31), Decimal("500000"))
+        create_distribution(test_db, class_fund.id, date(2024, 12, 31), Decimal("500000"))
 
         calculator = MetricsCalculator(test_db)
 
         # Calculate metrics
-        metrics = calculator.calculate_all_metrics(sample_fund.id)
+        metrics = calculator.calculate_all_metrics(class_fund.id)
 
         # PIC = 1M
         assert metrics["pic"] == 1000000.0
@@ -256,26 +260,26 @@ class TestMetricsCalculatorScenarios:
         if metrics["irr"] is not None:
             assert metrics["irr"] < 0
 
-    def test_multiple_calls_and_distributions(self, test_db, sample_fund):
+    def test_multiple_calls_and_distributions(self, test_db, class_fund):
         """Test fund with multiple capital calls and distributions over time"""
         from tests.conftest import create_capital_call, create_distribution
 
         # Simulate 2-year fund lifecycle
         # Year 1: Multiple capital calls
-        create_capital_call(test_db, sample_fund.id, date(2023, 1, 15), Decimal("500000"))
-        create_capital_call(test_db, sample_fund.id, date(2023, 6, 15), Decimal("750000"))
-        create_capital_call(test_db, sample_fund.id, date(2023, 12, 15), Decimal("1000000"))
+        create_capital_call(test_db, class_fund.id, date(2023, 1, 15), Decimal("500000"))
+        create_capital_call(test_db, class_fund.id, date(2023, 6, 15), Decimal("750000"))
+        create_capital_call(test_db, class_fund.id, date(2023, 12, 15), Decimal("1000000"))
 
         # Year 2: Distributions start coming in
-        create_distribution(test_db, sample_fund.id, date(2024, 3, 15), Decimal("300000"))
-        create_distribution(test_db, sample_fund.id, date(2024, 6, 15), Decimal("600000"))
-        create_distribution(test_db, sample_fund.id, date(2024, 9, 15), Decimal("900000"))
-        create_distribution(test_db, sample_fund.id, date(2024, 12, 15), Decimal("500000"))
+        create_distribution(test_db, class_fund.id, date(2024, 3, 15), Decimal("300000"))
+        create_distribution(test_db, class_fund.id, date(2024, 6, 15), Decimal("600000"))
+        create_distribution(test_db, class_fund.id, date(2024, 9, 15), Decimal("900000"))
+        create_distribution(test_db, class_fund.id, date(2024, 12, 15), Decimal("500000"))
 
         calculator = MetricsCalculator(test_db)
 
         # Calculate metrics
-        metrics = calculator.calculate_all_metrics(sample_fund.id)
+        metrics = calculator.calculate_all_metrics(class_fund.id)
 
         # PIC = 500K + 750K + 1M = 2.25M
         assert metrics["pic"] == 2250000.0
@@ -290,22 +294,22 @@ class TestMetricsCalculatorScenarios:
         if metrics["irr"] is not None:
             assert metrics["irr"] >= 0
 
-    def test_fund_with_clawback_adjustments(self, test_db, sample_fund):
+    def test_fund_with_clawback_adjustments(self, test_db, class_fund):
         """Test fund with distribution clawbacks"""
         from tests.conftest import create_capital_call, create_distribution, create_adjustment
 
         # Capital call
-        create_capital_call(test_db, sample_fund.id, date(2024, 1, 15), Decimal("1000000"))
+        create_capital_call(test_db, class_fund.id, date(2024, 1, 15), Decimal("1000000"))
 
         # Distribution (recallable)
         create_distribution(
-            test_db, sample_fund.id, date(2024, 6, 15),
+            test_db, class_fund.id, date(2024, 6, 15),
             Decimal("800000"), is_recallable=True
         )
 
         # Clawback adjustment (reduces effective distributions)
         create_adjustment(
-            test_db, sample_fund.id, date(2024, 9, 15),
+            test_db, class_fund.id, date(2024, 9, 15),
             Decimal("100000"), adjustment_type="Clawback",
             category="Distribution", is_contribution_adjustment=False
         )
@@ -313,8 +317,8 @@ class TestMetricsCalculatorScenarios:
         calculator = MetricsCalculator(test_db)
 
         # Calculate metrics
-        pic = calculator.calculate_pic(sample_fund.id)
-        total_dist = calculator.calculate_total_distributions(sample_fund.id)
+        pic = calculator.calculate_pic(class_fund.id)
+        total_dist = calculator.calculate_total_distributions(class_fund.id)
 
         # PIC = 1M + 100K (clawback increases committed capital)
         # Note: This depends on how clawbacks are accounted
@@ -327,28 +331,28 @@ class TestMetricsCalculatorScenarios:
         # Distributions = 800K (clawback doesn't reduce this directly)
         assert total_dist == Decimal("800000")
 
-    def test_fund_with_management_fees(self, test_db, sample_fund):
+    def test_fund_with_management_fees(self, test_db, class_fund):
         """Test fund with separate investment and fee capital calls"""
         from tests.conftest import create_capital_call, create_distribution
 
         # Investment capital
         create_capital_call(
-            test_db, sample_fund.id, date(2024, 1, 15),
+            test_db, class_fund.id, date(2024, 1, 15),
             Decimal("1000000"), call_type="Investment"
         )
 
         # Management fee
         create_capital_call(
-            test_db, sample_fund.id, date(2024, 1, 15),
+            test_db, class_fund.id, date(2024, 1, 15),
             Decimal("100000"), call_type="Management Fee"
         )
 
         # Distribution
-        create_distribution(test_db, sample_fund.id, date(2024, 12, 15), Decimal("1200000"))
+        create_distribution(test_db, class_fund.id, date(2024, 12, 15), Decimal("1200000"))
 
         calculator = MetricsCalculator(test_db)
 
-        metrics = calculator.calculate_all_metrics(sample_fund.id)
+        metrics = calculator.calculate_all_metrics(class_fund.id)
 
         # PIC = Investment + Fees = 1M + 100K = 1.1M
         assert metrics["pic"] == 1100000.0
@@ -356,25 +360,25 @@ class TestMetricsCalculatorScenarios:
         # DPI = 1.2M / 1.1M ≈ 1.09
         assert metrics["dpi"] == pytest.approx(1.09, abs=0.01)
 
-    def test_fund_complete_lifecycle(self, test_db, sample_fund):
+    def test_fund_complete_lifecycle(self, test_db, class_fund):
         """Test fund through complete lifecycle: calls, distributions, exit"""
         from tests.conftest import create_capital_call, create_distribution
 
         # Phase 1: Investment period (Year 1-2)
-        create_capital_call(test_db, sample_fund.id, date(2022, 1, 1), Decimal("1000000"))
-        create_capital_call(test_db, sample_fund.id, date(2022, 6, 1), Decimal("1000000"))
-        create_capital_call(test_db, sample_fund.id, date(2023, 1, 1), Decimal("1000000"))
+        create_capital_call(test_db, class_fund.id, date(2022, 1, 1), Decimal("1000000"))
+        create_capital_call(test_db, class_fund.id, date(2022, 6, 1), Decimal("1000000"))
+        create_capital_call(test_db, class_fund.id, date(2023, 1, 1), Decimal("1000000"))
 
         # Phase 2: Early distributions (Year 3-4)
-        create_distribution(test_db, sample_fund.id, date(2023, 6, 1), Decimal("500000"))
-        create_distribution(test_db, sample_fund.id, date(2024, 1, 1), Decimal("750000"))
+        create_distribution(test_db, class_fund.id, date(2023, 6, 1), Decimal("500000"))
+        create_distribution(test_db, class_fund.id, date(2024, 1, 1), Decimal("750000"))
 
         # Phase 3: Major exit (Year 5)
-        create_distribution(test_db, sample_fund.id, date(2024, 6, 1), Decimal("3000000"))
+        create_distribution(test_db, class_fund.id, date(2024, 6, 1), Decimal("3000000"))
 
         calculator = MetricsCalculator(test_db)
 
-        metrics = calculator.calculate_all_metrics(sample_fund.id)
+        metrics = calculator.calculate_all_metrics(class_fund.id)
 
         # PIC = 3M
         assert metrics["pic"] == 3000000.0
@@ -398,24 +402,18 @@ class TestMetricsCalculatorPerformance:
 
     def test_calculate_with_many_transactions(self, test_db, sample_fund):
         """Test performance with 1000+ transactions"""
-        from tests.conftest import create_capital_call, create_distribution
+        from tests.conftest import create_capital_calls_bulk, create_distributions_bulk
         import time
 
-        # Create 500 capital calls
-        for i in range(500):
-            create_capital_call(
-                test_db, sample_fund.id,
-                date(2020 + i // 365, 1 + (i % 12), 1 + (i % 28)),
-                Decimal(str(10000 + i * 100))
-            )
-
-        # Create 500 distributions
-        for i in range(500):
-            create_distribution(
-                test_db, sample_fund.id,
-                date(2021 + i // 365, 1 + (i % 12), 1 + (i % 28)),
-                Decimal(str(8000 + i * 80))
-            )
+        # Create 500 capital calls and 500 distributions, one INSERT each
+        create_capital_calls_bulk(test_db, sample_fund.id, [
+            (date(2020 + i // 365, 1 + (i % 12), 1 + (i % 28)), Decimal(10000 + i * 100))
+            for i in range(500)
+        ])
+        create_distributions_bulk(test_db, sample_fund.id, [
+            (date(2021 + i // 365, 1 + (i % 12), 1 + (i % 28)), Decimal(8000 + i * 80))
+            for i in range(500)
+        ])
 
         calculator = MetricsCalculator(test_db)
 
@@ -103,6 +103,12 @@ class TestTableParser:
         result = parser._parse_date(None)
         assert result is None
 
+    def test_parse_date_rejects_amounts(self, parser):
+        """Test that amounts and short numbers are not parsed as dates"""
+        assert parser._parse_date("$1,500,000") is None
+        assert parser._parse_date("€250,000.00") is None
+        assert parser._parse_date("2024") is None
+
     # ==================== Amount Parsing Tests ====================
 
     def test_parse_simple_amount(self, parser):
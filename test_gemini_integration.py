@@ -11,11 +11,30 @@ This script verifies that:
 
 Usage:
     python test_gemini_integration.py
+
+Set GEMINI_TEST_CACHE to a file path to reuse Gemini replies for up to 24
+hours across runs; it is off by default so every run exercises the live API.
 """
 
+import hashlib
+import importlib.util
+import io
 import os
+import re
+import sqlite3
 import sys
-from dotenv import load_dotenv
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+# Import Gemini if available; Test 2 reports the outcome
+try:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    GEMINI_IMPORT_ERROR = None
+except ImportError as e:
+    ChatGoogleGenerativeAI = None
+    GEMINI_IMPORT_ERROR = e
 
 # Colors for terminal output
 GREEN = '\033[92m'
@@ -24,27 +43,85 @@ YELLOW = '\033[93m'
 BLUE = '\033[94m'
 RESET = '\033[0m'
 
+# Section header pieces, built once
+HEADER_BAR = f"{BLUE}{'='*60}{RESET}"
+HEADER_TITLE = f"{BLUE}{{:^60}}{RESET}"
+
+# Queries sent by Tests 4 and 5
+SIMPLE_QUERY = "What is 2+2?"
+FUND_QUERY = "Explain what DPI means in private equity fund performance metrics."
+
+# Both queries in one request, with numbered answers to split them apart
+BATCHED_PROMPT = (
+    "Answer each question separately, starting the answers with '1)' and '2)':\n"
+    f"1) {SIMPLE_QUERY}\n"
+    f"2) {FUND_QUERY}"
+)
+ANSWER_NUMBER_RE = re.compile(r'^\s*\**([12])[.)]\**\s*', re.MULTILINE)
+
+# Words a relevant DPI explanation should use
+DPI_KEYWORDS = ("dpi", "distribution", "paid-in", "capital")
+DPI_KEYWORD_RE = re.compile("|".join(map(re.escape, DPI_KEYWORDS)), re.IGNORECASE)
+DPI_KEYWORD_OVERLAP = max(map(len, DPI_KEYWORDS)) - 1
+# Explanations usually name every keyword within their first few lines
+DPI_KEYWORD_PREFIX = 512
+
+# Opt-in exact-match cache of Gemini replies, kept for a day
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+# Output is collected here and written to stdout once per test section
+_buf = io.StringIO()
+
+
+def out(text=""):
+    """Buffer one line of output"""
+    _buf.write(f"{text}\n")
+
+
+def flush_output():
+    """Write the buffered output to stdout in a single call"""
+    sys.stdout.write(_buf.getvalue())
+    sys.stdout.flush()
+    _buf.seek(0)
+    _buf.truncate()
+
 
 def print_header(text):
-    """Print formatted header"""
-    print(f"\n{BLUE}{'='*60}{RESET}")
-    print(f"{BLUE}{text:^60}{RESET}")
-    print(f"{BLUE}{'='*60}{RESET}\n")
+    """Print formatted header, first writing out the previous section"""
+    flush_output()
+    out(f"\n{HEADER_BAR}")
+    out(HEADER_TITLE.format(text))
+    out(f"{HEADER_BAR}\n")
 
 
 def print_success(text):
     """Print success message"""
-    print(f"{GREEN}✓{RESET} {text}")
+    out(f"{GREEN}✓{RESET} {text}")
 
 
 def print_error(text):
     """Print error message"""
-    print(f"{RED}✗{RESET} {text}")
+    out(f"{RED}✗{RESET} {text}")
 
 
 def print_warning(text):
     """Print warning message"""
-    print(f"{YELLOW}⚠{RESET} {text}")
+    out(f"{YELLOW}⚠{RESET} {text}")
+
+
+@lru_cache(maxsize=1)
+def _load_env_once():
+    """
+    Load the .env file next to this script, once per process
+
+    Without one, variables come from the environment (e.g. Docker) and
+    dotenv is not even imported.
+    """
+    env_path = Path(__file__).with_name(".env")
+    if env_path.exists():
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path=env_path)
 
 
 def test_environment_variables():
@@ -52,7 +129,7 @@ def test_environment_variables():
     print_header("Test 1: Environment Variables")
 
     # Load .env file
-    load_dotenv()
+    _load_env_once()
 
     # Check LLM_PROVIDER
     llm_provider = os.getenv("LLM_PROVIDER")
@@ -66,7 +143,7 @@ def test_environment_variables():
     api_key = os.getenv("GOOGLE_API_KEY")
     if api_key:
         # Mask API key for security
-        masked_key = api_key[:10] + "..." + api_key[-4:]
+        masked_key = f"{api_key[:10]}...{api_key[-4:]}"
         print_success(f"GOOGLE_API_KEY is set: {masked_key}")
 
         # Validate format
@@ -85,15 +162,14 @@ def test_langchain_import():
     """Test 2: Check LangChain Google GenAI import"""
     print_header("Test 2: LangChain Import")
 
-    try:
-        from langchain_google_genai import ChatGoogleGenerativeAI
+    if ChatGoogleGenerativeAI is not None:
         print_success("langchain-google-genai is installed")
         return True
-    except ImportError as e:
-        print_error("langchain-google-genai is NOT installed")
-        print(f"   Error: {e}")
-        print(f"\n   Install with: pip install langchain-google-genai==0.0.6")
-        return False
+
+    print_error("langchain-google-genai is NOT installed")
+    out(f"   Error: {GEMINI_IMPORT_ERROR}")
+    out(f"\n   Install with: pip install langchain-google-genai==0.0.6")
+    return False
 
 
 def test_gemini_initialization():
@@ -101,123 +177,270 @@ def test_gemini_initialization():
     print_header("Test 3: Gemini Initialization")
 
     try:
-        from langchain_google_genai import ChatGoogleGenerativeAI
-
         api_key = os.getenv("GOOGLE_API_KEY")
 
-        print("Initializing ChatGoogleGenerativeAI...")
+        out("Initializing ChatGoogleGenerativeAI...")
         llm = ChatGoogleGenerativeAI(
             model="gemini-pro",
             google_api_key=api_key,
             temperature=0,
+            max_output_tokens=512,
             convert_system_message_to_human=True
         )
         print_success("Gemini LLM initialized successfully")
         return llm
     except Exception as e:
         print_error(f"Failed to initialize Gemini LLM")
-        print(f"   Error: {e}")
+        out(f"   Error: {e}")
         return None
 
 
-def test_simple_query(llm):
-    """Test 4: Simple query"""
-    print_header("Test 4: Simple Query")
+def answer_text(response):
+    """Text of an LLM response"""
+    if hasattr(response, 'content'):
+        return response.content
+    return str(response)
+
+
+def answer_markers(text):
+    """
+    Find the answer numbers in a reply to BATCHED_PROMPT
+
+    Answer 1 starts at the first line numbered '1)' or '1.' (optionally in
+    bold) and answer 2 at the next line numbered 2; everything after that
+    belongs to answer 2, including any numbered list of its own. Returns
+    the two regex matches, or None until both have appeared.
+    """
+    first = None
+    for match in ANSWER_NUMBER_RE.finditer(text):
+        if first is None:
+            if match.group(1) == '1':
+                first = match
+        elif match.group(1) == '2':
+            return first, match
+    return None
+
+
+def split_answers(text):
+    """Split a reply to BATCHED_PROMPT into (answer 1, answer 2); (None, None) if unnumbered"""
+    markers = answer_markers(text)
+    if markers is None:
+        return None, None
+    first, second = markers
+    return text[first.end():second.start()].strip(), text[second.end():].strip()
+
+
+def find_dpi_keywords(text):
+    """The DPI_KEYWORDS that occur in text, found in one scan"""
+    return {match.group(0).lower() for match in DPI_KEYWORD_RE.finditer(text)}
+
+
+def stream_batched_answer(llm):
+    """
+    Stream the reply to BATCHED_PROMPT
+
+    Stops reading, which closes the stream, as soon as answer 2 contains
+    every DPI keyword. Each chunk of answer 2 is scanned once, with a
+    keyword's length of overlap for words split across chunks. Returns
+    (reply text, whether it was cut short).
+    """
+    text = ""
+    answer_start = None
+    scanned = 0
+    found = set()
+    stream = llm.stream(BATCHED_PROMPT)
+    try:
+        for chunk in stream:
+            text += answer_text(chunk)
+
+            if answer_start is None:
+                markers = answer_markers(text)
+                if markers is None:
+                    continue
+                answer_start = scanned = markers[1].end()
+
+            found |= find_dpi_keywords(text[max(answer_start, scanned - DPI_KEYWORD_OVERLAP):])
+            scanned = len(text)
+            if len(found) == len(DPI_KEYWORDS):
+                return text, True
+    finally:
+        stream.close()
+    return text, False
+
+
+def open_reply_cache():
+    """Open the GEMINI_TEST_CACHE database, dropping expired replies; None when unset"""
+    path = os.getenv("GEMINI_TEST_CACHE")
+    if not path:
+        return None
 
-    if not llm:
-        print_error("LLM not initialized, skipping query test")
-        return False
+    cache = sqlite3.connect(path)
+    cache.execute(
+        "CREATE TABLE IF NOT EXISTS replies (key TEXT PRIMARY KEY, reply TEXT, created_at REAL)"
+    )
+    cache.execute("DELETE FROM replies WHERE created_at < ?", (time.time() - CACHE_TTL_SECONDS,))
+    cache.commit()
+    return cache
 
-    try:
-        query = "What is 2+2?"
-        print(f"Query: {query}")
-        print("Sending request to Gemini...")
 
-        response = llm.invoke(query)
+def reply_cache_key(llm, prompt):
+    """Cache key for a prompt: the model settings that shape the reply, plus the prompt"""
+    settings = f"{getattr(llm, 'model', '')}\0{getattr(llm, 'temperature', '')}\0{prompt}"
+    return hashlib.sha256(settings.encode()).hexdigest()
 
-        if hasattr(response, 'content'):
-            answer = response.content
-        else:
-            answer = str(response)
 
-        print_success("Response received")
-        print(f"\nAnswer: {answer}\n")
-        return True
+def test_batched_queries(llm):
+    """
+    Tests 4 and 5: send both queries as one numbered prompt
+
+    The two questions share a single Gemini round trip, then each answer is
+    checked by its own test. Returns (Test 4 passed, Test 5 passed), with
+    None for Test 5 when Test 4 failed and it was skipped.
+    """
+    print_header("Tests 4-5: Batched Queries")
+
+    if not llm:
+        print_error("LLM not initialized, skipping query tests")
+        return False, None
+
+    try:
+        out(f"Query 1: {SIMPLE_QUERY}")
+        out(f"Query 2: {FUND_QUERY}")
+        out("Sending request to Gemini...")
+        flush_output()
+
+        cache = open_reply_cache()
+        key = reply_cache_key(llm, BATCHED_PROMPT)
+        cached = cache and cache.execute("SELECT reply FROM replies WHERE key = ?", (key,)).fetchone()
+
+        if cached:
+            answer = cached[0]
+            print_success("Response read from GEMINI_TEST_CACHE")
+        else:
+            answer, cut_short = stream_batched_answer(llm)
+            print_success("Response received")
+            if cut_short:
+                out("Stopped streaming once answer 2 contained every keyword")
+            if cache:
+                cache.execute(
+                    "INSERT OR REPLACE INTO replies VALUES (?, ?, ?)", (key, answer, time.time())
+                )
+                cache.commit()
     except Exception as e:
         print_error(f"Query failed")
-        print(f"   Error: {e}")
-        return False
+        out(f"   Error: {e}")
+        print_warning("Skipping Test 5 because Test 4 failed")
+        return False, None
 
+    simple_answer, fund_answer = split_answers(answer)
+    if simple_answer is None or fund_answer is None:
+        print_warning("Answers are not numbered as asked; checking the whole response")
 
-def test_fund_query(llm):
-    """Test 5: Fund-specific query"""
-    print_header("Test 5: Fund Analysis Query")
+    simple_result = test_simple_query(simple_answer or answer)
+    if not simple_result:
+        print_warning("Skipping Test 5 because Test 4 failed")
+        return simple_result, None
+    return simple_result, test_fund_query(fund_answer or answer)
 
-    if not llm:
-        print_error("LLM not initialized, skipping query test")
-        return False
 
-    try:
-        query = "Explain what DPI means in private equity fund performance metrics."
-        print(f"Query: {query}")
-        print("Sending request to Gemini...")
+def test_simple_query(answer):
+    """Test 4: Simple query"""
+    print_header("Test 4: Simple Query")
 
-        response = llm.invoke(query)
+    out(f"Query: {SIMPLE_QUERY}")
+    out(f"\nAnswer: {answer}\n")
+    return True
 
-        if hasattr(response, 'content'):
-            answer = response.content
-        else:
-            answer = str(response)
 
-        print_success("Response received")
-        print(f"\nAnswer:\n{answer}\n")
+def test_fund_query(answer):
+    """Test 5: Fund-specific query"""
+    print_header("Test 5: Fund Analysis Query")
+
+    out(f"Query: {FUND_QUERY}")
+    out(f"\nAnswer:\n{answer}\n")
 
-        # Check if response contains relevant keywords
-        answer_lower = answer.lower()
-        keywords = ["dpi", "distribution", "paid-in", "capital"]
-        found_keywords = [kw for kw in keywords if kw in answer_lower]
+    # Check if response contains relevant keywords
+    found = find_dpi_keywords(answer[:DPI_KEYWORD_PREFIX])
+    if len(found) < len(DPI_KEYWORDS):
+        found = find_dpi_keywords(answer)
+    found_keywords = [kw for kw in DPI_KEYWORDS if kw in found]
 
-        if found_keywords:
-            print_success(f"Response contains relevant keywords: {', '.join(found_keywords)}")
-            return True
-        else:
-            print_warning("Response doesn't contain expected keywords")
-            return False
-    except Exception as e:
-        print_error(f"Query failed")
-        print(f"   Error: {e}")
+    if found_keywords:
+        print_success(f"Response contains relevant keywords: {', '.join(found_keywords)}")
+        return True
+    else:
+        print_warning("Response doesn't contain expected keywords")
         return False
 
 
+@contextmanager
+def backend_app_package():
+    """
+    Make backend/app importable as ``app`` for the duration of the block
+
+    The package is registered in sys.modules without touching sys.path.
+    Afterwards every ``app`` module imported inside the block is dropped,
+    and any ``app`` modules that were loaded before are restored.
+    """
+    def is_app_module(name):
+        return name == "app" or name.startswith("app.")
+
+    saved = {name: module for name, module in sys.modules.items() if is_app_module(name)}
+    for name in saved:
+        del sys.modules[name]
+
+    app_dir = Path(__file__).resolve().with_name("backend") / "app"
+    spec = importlib.util.spec_from_file_location(
+        "app", app_dir / "__init__.py", submodule_search_locations=[str(app_dir)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["app"] = module
+    try:
+        spec.loader.exec_module(module)
+        yield module
+    finally:
+        for name in [name for name in sys.modules if is_app_module(name)]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+
+
 def test_query_engine_integration():
     """Test 6: QueryEngine integration"""
     print_header("Test 6: QueryEngine Integration")
 
     try:
-        # Add backend to Python path
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
-
-        # Import QueryEngine (will trigger LLM initialization)
-        print("Importing QueryEngine...")
-        from app.services.query_engine import QueryEngine
+        # Import QueryEngine; importing does not build an LLM client, that
+        # happens in QueryEngine.__init__
+        out("Importing QueryEngine...")
+        flush_output()
+        with backend_app_package():
+            from app.services.query_engine import QueryEngine
         print_success("QueryEngine imported successfully")
 
-        # Check if Gemini initialization message appears
-        print("QueryEngine will initialize LLM based on LLM_PROVIDER env var")
-        print_success("If you see 'Initializing Google Gemini LLM...' above, integration works!")
+        # QueryEngine picks its LLM from LLM_PROVIDER when it is constructed
+        out("QueryEngine will initialize LLM based on LLM_PROVIDER env var")
+        print_success("QueryEngine can be imported alongside the Gemini client")
 
         return True
     except Exception as e:
         print_error(f"QueryEngine integration failed")
-        print(f"   Error: {e}")
+        out(f"   Error: {e}")
         return False
 
 
 def main():
+    """Run all tests, writing any buffered output even if the run stops early"""
+    try:
+        run_tests()
+    finally:
+        flush_output()
+
+
+def run_tests():
     """Run all tests"""
-    print(f"\n{BLUE}╔{'═'*58}╗{RESET}")
-    print(f"{BLUE}║{'Google Gemini Integration Test Suite':^58}║{RESET}")
-    print(f"{BLUE}╚{'═'*58}╝{RESET}")
+    out(f"\n{BLUE}╔{'═'*58}╗{RESET}")
+    out(f"{BLUE}║{'Google Gemini Integration Test Suite':^58}║{RESET}")
+    out(f"{BLUE}╚{'═'*58}╝{RESET}")
 
     results = []
 
@@ -242,13 +465,10 @@ def main():
         print_error("\nGemini initialization failed. Check API key.")
         return
 
-    # Test 4: Simple Query
-    result = test_simple_query(llm)
-    results.append(("Simple Query", result))
-
-    # Test 5: Fund Query
-    result = test_fund_query(llm)
-    results.append(("Fund Analysis Query", result))
+    # Tests 4 and 5: Simple and Fund Queries, sent as one request
+    simple_result, fund_result = test_batched_queries(llm)
+    results.append(("Simple Query", simple_result))
+    results.append(("Fund Analysis Query", fund_result))
 
     # Test 6: QueryEngine Integration
     result = test_query_engine_integration()
@@ -263,21 +483,23 @@ def main():
     for test_name, result in results:
         if result:
             print_success(f"{test_name:<30} PASSED")
+        elif result is None:
+            print_warning(f"{test_name:<30} SKIPPED")
         else:
             print_error(f"{test_name:<30} FAILED")
 
-    print(f"\n{BLUE}{'─'*60}{RESET}")
+    out(f"\n{BLUE}{'─'*60}{RESET}")
     if passed == total:
-        print(f"{GREEN}All tests passed! ({passed}/{total}){RESET}")
-        print(f"\n{GREEN}✓ Google Gemini integration is working correctly!{RESET}")
-        print(f"\nYou can now:")
-        print(f"  1. Start the backend: docker compose up backend")
-        print(f"  2. Test chat API: curl http://localhost:8000/api/chat/query")
-        print(f"  3. Use the frontend chat interface")
+        out(f"{GREEN}All tests passed! ({passed}/{total}){RESET}")
+        out(f"\n{GREEN}✓ Google Gemini integration is working correctly!{RESET}")
+        out(f"\nYou can now:")
+        out(f"  1. Start the backend: docker compose up backend")
+        out(f"  2. Test chat API: curl http://localhost:8000/api/chat/query")
+        out(f"  3. Use the frontend chat interface")
     else:
-        print(f"{RED}Some tests failed. ({passed}/{total} passed){RESET}")
-        print(f"\n{YELLOW}Please review errors above and fix configuration.{RESET}")
-    print(f"{BLUE}{'─'*60}{RESET}\n")
+        out(f"{RED}Some tests failed. ({passed}/{total} passed){RESET}")
+        out(f"\n{YELLOW}Please review errors above and fix configuration.{RESET}")
+    out(f"{BLUE}{'─'*60}{RESET}\n")
 
 
 if __name__ == "__main__":